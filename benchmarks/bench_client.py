@@ -0,0 +1,70 @@
+"""
+Per-ticket latency of a one-shot requests.post (the old send_ticket path) versus the
+pooled, keep-alive FreshdeskClient, against the local stub server.
+
+    python benchmarks/bench_client.py --tickets 200 --tls
+"""
+import base64
+import os
+import statistics
+import time
+
+import requests
+
+from harness import load_ticketmaker, result, run_standalone
+from stub_freshdesk import StubFreshdesk
+
+def time_tickets(send, count):
+    samples = []
+    for idx in range(count):
+        started = time.perf_counter()
+        response = send(idx)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 201, response.status_code
+    return samples
+
+def describe(label, samples):
+    ms = sorted(sample * 1000 for sample in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{label:<24} mean {statistics.mean(ms):7.2f} ms   p50 {statistics.median(ms):7.2f} ms   p95 {p95:7.2f} ms")
+    return statistics.mean(ms), statistics.median(ms), p95
+
+def add_arguments(parser):
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server processing delay in seconds")
+    parser.add_argument("--tls", action="store_true", help="serve the stub over HTTPS to include handshake cost")
+
+QUICK_ARGS = ["--tickets", "50"]
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    data = ticketmaker.build_ticket_data("Benchmark ticket", "bench@example.com", "<p>Printer on fire</p>", 1, 2)
+
+    with StubFreshdesk(latency=args.latency, tls=args.tls) as stub:
+        if stub.cert_path:
+            # Takes precedence over Session.verify, so set it for both code paths
+            os.environ["REQUESTS_CA_BUNDLE"] = stub.cert_path
+        api_url = f"{stub.api_url}/api/v2/tickets"
+
+        def send_one_shot(idx):
+            encoded_credentials = base64.b64encode(b"benchmark-api-key:X").decode("utf-8")
+            headers = {"Authorization": f"Basic {encoded_credentials}", "Content-Type": "application/json"}
+            return requests.post(api_url, headers=headers, json=data)
+
+        client = ticketmaker.FreshdeskClient(stub.api_url, "benchmark-api-key")
+
+        one_shot = describe("requests.post per ticket", time_tickets(send_one_shot, args.tickets))
+        pooled = describe("FreshdeskClient", time_tickets(lambda idx: client.create_ticket(data), args.tickets))
+        client.close()
+
+    print(f"saved per ticket: {one_shot[0] - pooled[0]:.2f} ms ({(1 - pooled[0] / one_shot[0]) * 100:.0f}%)")
+    params = {"tickets": args.tickets, "latency": args.latency, "tls": args.tls}
+    results = []
+    for label, (mean, p50, p95) in (("one_shot", one_shot), ("freshdesk_client", pooled)):
+        results.append(result("client", f"{label}.mean", mean, "ms", **params))
+        results.append(result("client", f"{label}.p50", p50, "ms", **params))
+        results.append(result("client", f"{label}.p95", p95, "ms", **params))
+    return results
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
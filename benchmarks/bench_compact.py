@@ -0,0 +1,61 @@
+"""
+Description HTML compaction over pasted content: Outlook, Google Docs and web page
+fragments from samples/, each on its own and concatenated into one long paste.
+
+    python benchmarks/bench_compact.py --repeat 200 --concat 20
+"""
+import glob
+import json
+import os
+import time
+
+from harness import load_ticketmaker, result, run_standalone
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "samples")
+
+def load_samples():
+    samples = {}
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            samples[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    return samples
+
+def body_bytes(ticketmaker, description):
+    data = ticketmaker.build_ticket_data("VPN keeps dropping", "bench@example.com", description, 1, 2)
+    return len(json.dumps(data).encode("utf-8"))
+
+def per_call_ms(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def add_arguments(parser):
+    parser.add_argument("--repeat", type=int, default=200, help="compactions timed per sample")
+    parser.add_argument("--concat", type=int, default=20, help="copies of every sample in the long paste")
+
+QUICK_ARGS = ["--repeat", "20", "--concat", "5"]
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    samples = load_samples()
+    samples["long_paste"] = "".join(samples.values()) * args.concat
+    results = []
+    for name, description in samples.items():
+        repeat = max(1, args.repeat // args.concat) if name == "long_paste" else args.repeat
+        params = {"repeat": repeat, "concat": args.concat} if name == "long_paste" else {"repeat": repeat}
+        elapsed = per_call_ms(lambda: ticketmaker.compact_html(description), repeat)
+        compacted = ticketmaker.compact_html(description)
+        before, after = body_bytes(ticketmaker, description), body_bytes(ticketmaker, compacted)
+        print(f"{name:<12} {len(description) / 1024:8.1f} KB -> {len(compacted) / 1024:7.1f} KB   "
+              f"body {before / 1024:8.1f} KB -> {after / 1024:7.1f} KB   {elapsed:8.2f} ms")
+        results += [
+            result("compact", f"{name}.time", elapsed, "ms", **params),
+            result("compact", f"{name}.throughput", len(description) / 1e6 / (elapsed / 1000), "MB/s", "higher", **params),
+            result("compact", f"{name}.body_bytes", after, "bytes", **params),
+            result("compact", f"{name}.body_reduction", 100 * (1 - after / before), "%", "higher", **params),
+        ]
+    return results
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
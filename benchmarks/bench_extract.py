@@ -0,0 +1,81 @@
+"""
+Embedded-image extraction over screenshot-heavy editor HTML: the original regex plus
+temp-file round trip versus the single-pass in-memory extract_embedded_images().
+
+    python benchmarks/bench_extract.py --images 36 --image-mb 3
+"""
+import base64
+import os
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from harness import load_ticketmaker, result, run_standalone
+
+def build_description(image_count, image_bytes):
+    """Editor-style HTML with paragraphs between pasted PNG screenshots."""
+    parts = []
+    for idx in range(image_count):
+        encoded = base64.b64encode(os.urandom(image_bytes)).decode("ascii")
+        parts.append(f"<p>Step {idx + 1}: the error dialog looks like this</p>")
+        parts.append(f'<img src="data:image/png;base64,{encoded}" style="max-width: 100%;">')
+    return "".join(parts)
+
+def legacy_extract(description, work_dir):
+    """The pre-rewrite path: regex findall, decode to files in a directory, read them back."""
+    paths = []
+    matches = re.findall(r'<img src="data:image/(.*?);base64,(.*?)"', description)
+    for idx, (img_type, img_data) in enumerate(matches):
+        file_path = os.path.join(work_dir, f"embedded_image_{idx + 1}.{img_type}")
+        with open(file_path, "wb") as img_file:
+            img_file.write(base64.b64decode(img_data))
+        paths.append(file_path)
+    images = []
+    for path in paths:
+        with open(path, "rb") as f:
+            images.append((os.path.basename(path), f.read()))
+        os.remove(path)
+    return description, images
+
+def measure(label, extract, description):
+    tracemalloc.start()
+    started = time.perf_counter()
+    html, images = extract(description)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<28} {elapsed * 1000:8.1f} ms   peak {peak / 1e6:7.1f} MB   "
+          f"images {len(images):3d}   description {len(html) / 1e6:7.2f} MB")
+    return elapsed, peak
+
+def add_arguments(parser):
+    parser.add_argument("--images", type=int, default=36)
+    parser.add_argument("--image-mb", type=float, default=3.0)
+
+QUICK_ARGS = ["--images", "6", "--image-mb", "1"]
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    description = build_description(args.images, int(args.image_mb * 1024 * 1024))
+    print(f"input description: {len(description) / 1e6:.1f} MB")
+    params = {"images": args.images, "image_mb": args.image_mb}
+
+    work_dir = tempfile.mkdtemp(prefix="bench-extract-")
+    try:
+        legacy, legacy_peak = measure("regex + temp files", lambda html: legacy_extract(html, work_dir), description)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    single_pass, peak = measure("extract_embedded_images", ticketmaker.extract_embedded_images, description)
+    print(f"speedup: {legacy / single_pass:.2f}x")
+    return [
+        result("extract", "legacy.time", legacy * 1000, "ms", **params),
+        result("extract", "legacy.peak_memory", legacy_peak / 1e6, "MB", **params),
+        result("extract", "extract_embedded_images.time", single_pass * 1000, "ms", **params),
+        result("extract", "extract_embedded_images.peak_memory", peak / 1e6, "MB", **params),
+        result("extract", "extract_embedded_images.throughput", len(description) / 1e6 / single_pass, "MB/s", "higher", **params),
+    ]
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
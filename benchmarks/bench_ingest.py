@@ -0,0 +1,116 @@
+"""
+Loopback ingestion API under a burst: concurrent keep-alive clients POST tickets while
+the GUI event loop keeps ticking, then the outbox drains them to the stub server.
+
+    python benchmarks/bench_ingest.py --requests 1000 --clients 8 --files-every 10
+
+Reports accepted requests per second, request latency and the longest gap between
+GUI timer ticks, which is what a user would feel as the tray UI freezing.
+"""
+import base64
+import http.client
+import json
+import os
+import socket
+import statistics
+import threading
+import time
+
+from harness import load_ticketmaker, result, run_standalone
+from stub_freshdesk import StubFreshdesk
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def ticket_body(idx, files_every, log_bytes):
+    ticket = {
+        "subject": f"disk usage above 90% on build-agent-{idx % 40:02d}",
+        "email": "monitoring@example.com",
+        "description": f"<p>Check <b>disk_usage</b> fired at sample {idx}: / is 91% full.</p>",
+        "priority": "high",
+    }
+    if files_every and idx % files_every == 0:
+        ticket["files"] = [{"name": "df.txt", "content": base64.b64encode(log_bytes).decode("ascii")}]
+    return json.dumps(ticket)
+
+def client(port, indexes, args, log_bytes, latencies, statuses):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    for idx in indexes:
+        started = time.perf_counter()
+        connection.request("POST", "/tickets", ticket_body(idx, args.files_every, log_bytes),
+                           {"Content-Type": "application/json", "Authorization": f"Bearer {args.token}"})
+        response = connection.getresponse()
+        response.read()
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses.append(response.status)
+    connection.close()
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--files-every", type=int, default=10, help="attach a small log file to every Nth ticket")
+    parser.add_argument("--latency", type=float, default=0.01, help="stub server processing delay in seconds")
+    parser.add_argument("--timeout", type=float, default=600)
+
+QUICK_ARGS = ["--requests", "200", "--clients", "4"]
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    from PyQt5.QtCore import QEventLoop, QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+    ticketmaker.INGEST_PORT = port = free_port()
+    ticketmaker.INGEST_TOKEN = args.token = "benchmark-ingest-token"
+    log_bytes = os.urandom(16 * 1024)
+    latencies, statuses, ticks = [], [], []
+
+    with StubFreshdesk(latency=args.latency) as stub:
+        window = ticketmaker.TicketCreator({"api_url": stub.api_url, "api_key": "benchmark-api-key"})
+        created = []
+        window.drainer.created.connect(lambda ticket_id, ticket, entry: created.append(ticket_id))
+        timer = QTimer()
+        timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        timer.start(5)
+
+        clients = [threading.Thread(target=client, args=(port, range(idx, args.requests, args.clients), args,
+                                                         log_bytes, latencies, statuses))
+                   for idx in range(args.clients)]
+        started = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        while any(thread.is_alive() for thread in clients):
+            app.processEvents(QEventLoop.AllEvents, 5)
+        accepted_in = time.perf_counter() - started
+        burst_ticks = list(ticks)
+
+        deadline = time.monotonic() + args.timeout
+        while len(created) < statuses.count(202) and time.monotonic() < deadline:
+            app.processEvents(QEventLoop.AllEvents, 50)
+            time.sleep(0.001)
+        drained_in = time.perf_counter() - started
+        timer.stop()
+        window.exit_application()
+
+    accepted = statuses.count(202)
+    gaps = [(later - earlier) * 1000 for earlier, later in zip(burst_ticks, burst_ticks[1:])] or [0.0]
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{accepted} of {args.requests} accepted in {accepted_in:.2f} s ({accepted / accepted_in:.0f} req/s), "
+          f"latency p50 {statistics.median(latencies):.1f} ms p95 {p95:.1f} ms")
+    print(f"GUI timer gap during the burst: max {max(gaps):.1f} ms (5 ms timer); "
+          f"{len(created)} created in {drained_in:.2f} s")
+
+    params = {"requests": args.requests, "clients": args.clients, "files_every": args.files_every, "latency": args.latency}
+    return [
+        result("ingest", "accept_rate", accepted / accepted_in, "req/s", "higher", **params),
+        result("ingest", "latency.p50", statistics.median(latencies), "ms", **params),
+        result("ingest", "latency.p95", p95, "ms", **params),
+        result("ingest", "ui_gap.max", max(gaps), "ms", **params),
+        result("ingest", "drain_time", drained_in, "s", **params),
+    ]
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
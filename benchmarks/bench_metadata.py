@@ -0,0 +1,97 @@
+"""
+Local lookups that run per keystroke: email autocomplete over a large contact list and
+duplicate detection over the recent open tickets, plus the cost of building each index.
+
+    python benchmarks/bench_metadata.py --contacts 50000 --tickets 20000
+"""
+import random
+import string
+import time
+
+from harness import load_ticketmaker, result, run_standalone
+
+TOPICS = ["printer", "vpn", "outlook", "laptop", "password", "teams", "monitor", "wifi", "sharepoint", "badge"]
+PROBLEMS = ["offline", "not connecting", "crashes on start", "locked out", "very slow", "keeps asking to sign in",
+            "shows an error", "flickering", "cannot sync", "no sound"]
+PLACES = ["on floor 3", "in the Denver office", "after the update", "since this morning", "for the whole team",
+          "when working from home", "in meeting room B", "on my new machine"]
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+
+def fake_contacts(count, seed=0):
+    rng = random.Random(seed)
+    contacts = []
+    for idx in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))).capitalize()
+        contacts.append({"id": idx + 1, "name": f"{first} {last}",
+                         "email": f"{first.lower()}.{last.lower()}{idx}@example{idx % 40}.com"})
+    return contacts
+
+def fake_tickets(count, seed=0):
+    rng = random.Random(seed)
+    tickets = []
+    for idx in range(count):
+        subject = f"{rng.choice(TOPICS).capitalize()} {rng.choice(PROBLEMS)} {rng.choice(PLACES)}"
+        tickets.append({"id": idx + 1, "subject": subject, "status": rng.choice([2, 3]),
+                        "description": f"Hi, my {subject.lower()}. I already tried restarting. Ticket ref {idx}.",
+                        "updated_at": f"2026-01-01T00:00:{idx % 60:02d}Z"})
+    return tickets
+
+def add_arguments(parser):
+    parser.add_argument("--contacts", type=int, default=50000)
+    parser.add_argument("--tickets", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=20000)
+
+QUICK_ARGS = ["--contacts", "10000", "--tickets", "5000", "--lookups", "5000"]
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    contacts = fake_contacts(args.contacts)
+    started = time.perf_counter()
+    index = ticketmaker.ContactIndex(contacts)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # What someone types, one keystroke at a time
+    rng = random.Random(1)
+    prefixes = []
+    while len(prefixes) < args.lookups:
+        email = rng.choice(contacts)["email"]
+        prefixes += [email[:length] for length in range(1, min(len(email), 12) + 1)]
+    prefixes = prefixes[:args.lookups]
+    started = time.perf_counter()
+    for prefix in prefixes:
+        index.complete(prefix)
+    lookup_us = (time.perf_counter() - started) * 1e6 / len(prefixes)
+    print(f"ContactIndex over {args.contacts} contacts ({len(index)} keys) built in {build_ms:.0f} ms")
+    print(f"complete(): {lookup_us:.1f} us per keystroke")
+
+    tickets = fake_tickets(args.tickets)
+    started = time.perf_counter()
+    ticket_index = ticketmaker.TicketIndex(tickets)
+    index_ms = (time.perf_counter() - started) * 1000
+    subjects = []
+    while len(subjects) < args.lookups // 10:
+        subject = rng.choice(tickets)["subject"]
+        subjects += [subject[:length] for length in range(8, len(subject) + 1, 4)]
+    samples = []
+    for subject in subjects:
+        started = time.perf_counter()
+        ticket_index.search(subject)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    search_p50, search_p95 = samples[len(samples) // 2], samples[int(len(samples) * 0.95) - 1]
+    print(f"TicketIndex over {args.tickets} tickets built in {index_ms:.0f} ms")
+    print(f"search(): p50 {search_p50:.3f} ms   p95 {search_p95:.3f} ms   max {samples[-1]:.3f} ms")
+
+    params = {"contacts": args.contacts, "tickets": args.tickets}
+    return [
+        result("metadata", "contact_index.build_time", build_ms, "ms", **params),
+        result("metadata", "contact_index.lookup_time", lookup_us, "us", **params),
+        result("metadata", "ticket_index.build_time", index_ms, "ms", **params),
+        result("metadata", "ticket_index.search_p50", search_p50, "ms", **params),
+        result("metadata", "ticket_index.search_p95", search_p95, "ms", **params),
+    ]
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
@@ -0,0 +1,78 @@
+"""
+Ticket payload and multipart body construction: build_ticket_data(), JSON encoding and
+streaming a MultipartBody with file attachments and in-memory screenshots.
+
+    python benchmarks/bench_payload.py --attachments 3 --attachment-mb 5 --screenshots 4
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from harness import load_ticketmaker, make_screenshot, result, run_standalone, screenshot_html
+
+def add_arguments(parser):
+    parser.add_argument("--repeat", type=int, default=200, help="iterations for the small payload timings")
+    parser.add_argument("--attachments", type=int, default=3)
+    parser.add_argument("--attachment-mb", type=float, default=5.0)
+    parser.add_argument("--screenshots", type=int, default=4)
+
+QUICK_ARGS = ["--repeat", "50", "--attachments", "2", "--attachment-mb", "2", "--screenshots", "2"]
+
+def per_call_ms(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    screenshots = [make_screenshot(seed=idx) for idx in range(args.screenshots)]
+    description = screenshot_html(screenshots)
+    description, images = ticketmaker.extract_embedded_images(description)
+    params = {"attachments": args.attachments, "attachment_mb": args.attachment_mb, "screenshots": args.screenshots}
+
+    build_ms = per_call_ms(
+        lambda: ticketmaker.build_ticket_data("Printer on fire", "bench@example.com", description, 1, 2), args.repeat)
+    data = ticketmaker.build_ticket_data("Printer on fire", "bench@example.com", description, 1, 2)
+    json_ms = per_call_ms(lambda: json.dumps(data).encode("utf-8"), args.repeat)
+    print(f"build_ticket_data      {build_ms:8.3f} ms")
+    print(f"JSON payload           {json_ms:8.3f} ms")
+
+    work_dir = tempfile.mkdtemp(prefix="bench-payload-")
+    try:
+        files = []
+        for idx in range(args.attachments):
+            path = os.path.join(work_dir, f"log_{idx + 1}.txt")
+            with open(path, "wb") as f:
+                f.write(os.urandom(int(args.attachment_mb * 1024 * 1024)))
+            files.append((os.path.basename(path), path, None))
+        files += [(name, None, content) for name, content in images]
+
+        construct_ms = per_call_ms(lambda: ticketmaker.MultipartBody(data, files), args.repeat)
+        body = ticketmaker.MultipartBody(data, files)
+        tracemalloc.start()
+        started = time.perf_counter()
+        streamed = sum(len(chunk) for chunk in body)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    assert streamed == len(body), (streamed, len(body))
+    print(f"MultipartBody()        {construct_ms:8.3f} ms")
+    print(f"stream {streamed / 1e6:6.1f} MB        {elapsed * 1000:8.1f} ms   {streamed / 1e6 / elapsed:7.1f} MB/s   "
+          f"peak {peak / 1e6:5.1f} MB")
+
+    return [
+        result("payload", "build_ticket_data.time", build_ms, "ms", **params),
+        result("payload", "json_payload.time", json_ms, "ms", **params),
+        result("payload", "multipart.construct_time", construct_ms, "ms", **params),
+        result("payload", "multipart.stream_throughput", streamed / 1e6 / elapsed, "MB/s", "higher", **params),
+        result("payload", "multipart.stream_peak_memory", peak / 1e6, "MB", **params),
+    ]
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
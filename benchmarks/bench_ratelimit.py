@@ -0,0 +1,104 @@
+"""
+Several TicketMaker processes sharing one Freshdesk account: 429s and throughput with the
+shared rate-limit governor versus unpaced requests that back off only after a 429.
+
+Every process loads ticketmaker against the same STORAGE_PATH, so the governed runs share
+one bucket through the state file, the way a tray app, a bulk import and a script would.
+The stub enforces a fixed window shorter than Freshdesk's minute to keep runs short.
+
+    python benchmarks/bench_ratelimit.py --processes 3 --threads 4 --tickets 150
+"""
+import multiprocessing
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ProcessPoolExecutor
+
+from harness import load_ticketmaker, result, run_standalone
+from stub_freshdesk import StubFreshdesk
+
+def send_tickets(api_url, storage_path, window, governed, threads, count):
+    """Create count tickets from one process; returns (created, 429 responses, started, finished)."""
+    ticketmaker = load_ticketmaker(api_url, storage_path=storage_path)
+    ticketmaker.RATE_LIMIT_WINDOW = window
+    client = ticketmaker.FreshdeskClient(api_url, "benchmark-api-key", rate_limit_wait=window / 2)
+    if not governed:
+        client.governor = types.SimpleNamespace(acquire=lambda max_wait: 0.0, observe=lambda response: None)
+    data = ticketmaker.build_ticket_data("Benchmark ticket", "bench@example.com", "<p>Printer on fire</p>", 1, 2)
+    lock = threading.Lock()
+    totals = {"left": count, "created": 0, "rate_limited": 0}
+    started = time.time()  # wall clock, comparable across processes
+
+    def worker():
+        while True:
+            with lock:
+                if totals["left"] <= 0:
+                    return
+                totals["left"] -= 1
+            while True:
+                try:
+                    response = client.create_ticket(data)
+                except ticketmaker.RateLimited as rate_limited:
+                    time.sleep(rate_limited.delay)  # the outbox would reschedule the ticket
+                    continue
+                if response.status_code == 201:
+                    with lock:
+                        totals["created"] += 1
+                    break
+                assert response.status_code == 429, response.status_code
+                with lock:
+                    totals["rate_limited"] += 1
+                time.sleep(ticketmaker.parse_retry_after(response.headers.get("Retry-After")) or 1)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    client.close()
+    return totals["created"], totals["rate_limited"], started, time.time()
+
+def run_mode(args, governed):
+    storage_path = tempfile.mkdtemp(prefix="ticketmaker-bench-ratelimit-")
+    share, extra = divmod(args.tickets, args.processes)
+    counts = [share + (idx < extra) for idx in range(args.processes)]
+    context = multiprocessing.get_context("spawn")
+    with StubFreshdesk(rate_limit_per_window=args.limit, window=args.window) as stub, \
+            ProcessPoolExecutor(args.processes, mp_context=context) as executor:
+        futures = [executor.submit(send_tickets, stub.api_url, storage_path, args.window, governed, args.threads, count)
+                   for count in counts]
+        outcomes = [future.result() for future in futures]
+    # From the first process done importing ticketmaker to the last ticket
+    elapsed = max(outcome[3] for outcome in outcomes) - min(outcome[2] for outcome in outcomes)
+    created = sum(outcome[0] for outcome in outcomes)
+    rate_limited = sum(outcome[1] for outcome in outcomes)
+    used = created / elapsed / (args.limit / args.window)
+    label = "governed" if governed else "unpaced"
+    print(f"{label:<10} {created} created, {rate_limited} x 429 in {elapsed:.1f}s "
+          f"({used * 100:.0f}% of the account limit)")
+    return rate_limited, elapsed, used
+
+def add_arguments(parser):
+    parser.add_argument("--processes", type=int, default=3)
+    parser.add_argument("--threads", type=int, default=4, help="concurrent senders per process")
+    parser.add_argument("--tickets", type=int, default=150, help="tickets created across all processes")
+    parser.add_argument("--limit", type=int, default=50, help="requests allowed per window")
+    parser.add_argument("--window", type=float, default=2.0, help="rate-limit window in seconds")
+
+QUICK_ARGS = ["--tickets", "80"]
+
+def run(args):
+    params = {"processes": args.processes, "threads": args.threads, "tickets": args.tickets,
+              "limit": args.limit, "window": args.window}
+    results = []
+    for governed in (False, True):
+        rate_limited, elapsed, used = run_mode(args, governed)
+        label = "governed" if governed else "unpaced"
+        results.append(result("ratelimit", f"{label}.rate_limited", rate_limited, "responses", **params))
+        results.append(result("ratelimit", f"{label}.elapsed", elapsed, "s", **params))
+        results.append(result("ratelimit", f"{label}.limit_used", used, "fraction", better="higher", **params))
+    return results
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
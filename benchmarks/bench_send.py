@@ -0,0 +1,152 @@
+"""
+End-to-end send_ticket throughput and memory for a realistic ticket mix, through the
+outbox and background drainer against the stub server (with optional 429s and 5xx).
+
+    python benchmarks/bench_send.py --tickets 100 --mix text=60,screenshots=30,attachments=10 --rate-limit-every 7
+
+The QtWebEngine editor is not started; each ticket enters through
+handle_description_content() with the HTML the editor would have returned.
+"""
+import os
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from harness import load_ticketmaker, make_screenshot, result, run_standalone, screenshot_html
+from stub_freshdesk import StubFreshdesk
+
+def add_arguments(parser):
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--mix", default="text=60,screenshots=30,attachments=10",
+                        help="relative weights of plain text, screenshot and file attachment tickets")
+    parser.add_argument("--screenshots-per-ticket", type=int, default=2)
+    parser.add_argument("--attachment-mb", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub server processing delay in seconds")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="answer every Nth request with a 429")
+    parser.add_argument("--error-every", type=int, default=0, help="answer every Nth request with a 503")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--retry-base-delay", type=float, default=0.05,
+                        help="outbox backoff base in seconds (the app uses 2)")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--tracemalloc", action="store_true", help="also report the Python heap peak (slower)")
+
+QUICK_ARGS = ["--tickets", "20", "--latency", "0.02", "--rate-limit-every", "7", "--error-every", "11", "--retry-after", "0"]
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        weights[kind.strip()] = int(weight or 1)
+    unknown = set(weights) - {"text", "screenshots", "attachments"}
+    if unknown:
+        raise SystemExit(f"Unknown ticket kinds in --mix: {', '.join(sorted(unknown))}")
+    return weights
+
+def build_tickets(args, work_dir):
+    """Deterministic list of (kind, description HTML, attachment paths) in the requested proportions."""
+    weights = parse_mix(args.mix)
+    total_weight = sum(weights.values())
+    kinds = []
+    for kind, weight in weights.items():
+        kinds += [kind] * round(args.tickets * weight / total_weight)
+    kinds = (kinds + ["text"] * args.tickets)[:args.tickets]
+    random.Random(0).shuffle(kinds)  # interleave kinds the same way on every run
+
+    screenshots = screenshot_html([make_screenshot(seed=idx) for idx in range(args.screenshots_per_ticket)])
+    attachment = os.path.join(work_dir, "event_log.evtx")
+    with open(attachment, "wb") as f:
+        f.write(os.urandom(int(args.attachment_mb * 1024 * 1024)))
+    text = "<p>The shared printer on floor 3 shows <b>offline</b> for everyone since this morning.</p>" * 8
+
+    tickets = []
+    for kind in kinds:
+        if kind == "screenshots":
+            tickets.append((kind, text + screenshots, []))
+        elif kind == "attachments":
+            tickets.append((kind, text, [attachment]))
+        else:
+            tickets.append((kind, text, []))
+    return tickets
+
+def run(args):
+    ticketmaker = load_ticketmaker()
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    app = QApplication.instance() or QApplication([])
+    # Success and error popups would block the event loop
+    for name in ("information", "warning", "critical"):
+        setattr(QMessageBox, name, staticmethod(lambda *args, **kwargs: QMessageBox.Ok))
+    ticketmaker.RETRY_BASE_DELAY = args.retry_base_delay
+
+    work_dir = tempfile.mkdtemp(prefix="bench-send-")
+    stub = StubFreshdesk(latency=args.latency, rate_limit_every=args.rate_limit_every,
+                         error_every=args.error_every, retry_after=args.retry_after)
+    try:
+        tickets = build_tickets(args, work_dir)
+        with stub:
+            window = ticketmaker.TicketCreator({"api_url": stub.api_url, "api_key": "benchmark-api-key"})
+            settled = []
+            window.drainer.created.connect(lambda ticket_id, ticket, entry: settled.append("created"))
+            window.drainer.rejected.connect(lambda ticket_id, message, entry: settled.append("rejected"))
+
+            if args.tracemalloc:
+                tracemalloc.start()
+            submit_ms = []
+            started = time.perf_counter()
+            for idx, (kind, description, attachments) in enumerate(tickets):
+                window.subject_input.setText(f"Benchmark {kind} ticket {idx + 1}")
+                window.email_input.setText("bench@example.com")
+                window.attachments = list(attachments)
+                window.submit_trace = ticketmaker.SubmissionTrace()
+                submit_started = time.perf_counter()
+                window.handle_description_content(description)
+                submit_ms.append((time.perf_counter() - submit_started) * 1000)
+                app.processEvents()
+
+            deadline = time.monotonic() + args.timeout
+            while len(settled) < len(tickets) and time.monotonic() < deadline:
+                app.processEvents(QEventLoop.AllEvents, 50)
+                time.sleep(0.001)
+            elapsed = time.perf_counter() - started
+            heap_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+            if args.tracemalloc:
+                tracemalloc.stop()
+            _, _, phases = window.metrics.summary()
+            window.exit_application()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    created = settled.count("created")
+    if len(settled) < len(tickets):
+        print(f"warning: only {len(settled)} of {len(tickets)} tickets settled before the timeout")
+    submit_ms.sort()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    print(f"{created} created, {settled.count('rejected')} rejected in {elapsed:.2f} s "
+          f"({created / elapsed:.1f} tickets/s), stub saw {dict(stub.statuses)}")
+    print(f"GUI-thread submit p50 {statistics.median(submit_ms):.2f} ms   "
+          f"p95 {submit_ms[int(len(submit_ms) * 0.95) - 1]:.2f} ms   peak RSS {peak_rss:.0f} MB")
+
+    params = {"tickets": args.tickets, "mix": args.mix, "latency": args.latency,
+              "rate_limit_every": args.rate_limit_every, "error_every": args.error_every}
+    results = [
+        result("send", "throughput", created / elapsed, "tickets/s", "higher", **params),
+        result("send", "wall_time", elapsed, "s", **params),
+        result("send", "submit.p50", statistics.median(submit_ms), "ms", **params),
+        result("send", "submit.p95", submit_ms[int(len(submit_ms) * 0.95) - 1], "ms", **params),
+        result("send", "peak_rss", peak_rss, "MB", **params),
+        result("send", "requests_per_ticket", stub.requests / max(1, created), "requests", **params),
+    ]
+    if heap_peak is not None:
+        results.append(result("send", "python_heap_peak", heap_peak / 1e6, "MB", **params))
+    for phase, _, p50, p95 in phases:
+        results.append(result("send", f"phase.{phase}.p50", p50, "ms", **params))
+        results.append(result("send", f"phase.{phase}.p95", p95, "ms", **params))
+    return results
+
+if __name__ == "__main__":
+    run_standalone(__doc__, add_arguments, run)
@@ -0,0 +1,142 @@
+"""
+Import src/ticketmaker.py on a Linux benchmark machine, plus shared fixtures and results.
+
+Qt runs offscreen, winreg is replaced by a module whose lookups always fail (so the light
+theme is used), msvcrt.locking is backed by fcntl, and DPAPI is replaced by an identity
+transform so the credential files in a throwaway STORAGE_PATH can hold plain text.
+
+Every benchmark returns a list of result() records, which write_results() saves as JSON
+so runs can be compared over time (see run.py).
+"""
+import argparse
+import base64
+import ctypes
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import types
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class _FakeCrypt32:
+    def CryptUnprotectData(self, encrypted_blob, description, entropy, reserved, prompt, flags, decrypted_blob):
+        decrypted_blob._obj.cbData = encrypted_blob._obj.cbData
+        decrypted_blob._obj.pbData = encrypted_blob._obj.pbData
+        return 1
+
+class _FakeKernel32:
+    def LocalFree(self, pointer):
+        return None
+
+def _raise_missing_key(*args):
+    raise OSError("winreg is not available on this platform")
+
+def _locking(fd, mode, nbytes):
+    import fcntl
+    fcntl.lockf(fd, fcntl.LOCK_EX if mode == 1 else fcntl.LOCK_UN, nbytes)
+
+def install_windows_stubs():
+    """Provide the Windows-only modules ticketmaker imports."""
+    import mimetypes  # noqa: F401 - must bind to the real (missing) winreg before the stub exists
+    sys.modules.setdefault("winreg", types.SimpleNamespace(
+        HKEY_CURRENT_USER=0x80000001,
+        OpenKey=_raise_missing_key,
+        QueryValueEx=_raise_missing_key
+    ))
+    sys.modules.setdefault("msvcrt", types.SimpleNamespace(LK_UNLCK=0, LK_LOCK=1, locking=_locking))
+    if not hasattr(ctypes, "windll"):
+        ctypes.windll = types.SimpleNamespace(crypt32=_FakeCrypt32(), kernel32=_FakeKernel32())
+
+def load_ticketmaker(api_url="127.0.0.1", api_key="benchmark-api-key", storage_path=None):
+    """Import ticketmaker against a STORAGE_PATH (a temporary one by default) and return the module."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    storage_path = storage_path or tempfile.mkdtemp(prefix="ticketmaker-bench-")
+    os.environ["TICKETMAKER_STORAGE_PATH"] = storage_path
+    with open(os.path.join(storage_path, "FreshdeskURL.dat"), "w") as f:
+        f.write(base64.b64encode(api_url.encode("utf-8")).decode("ascii"))
+    with open(os.path.join(storage_path, "FreshdeskAPIKey.dat"), "w") as f:
+        f.write(base64.b64encode(api_key.encode("utf-8")).decode("ascii"))
+
+    install_windows_stubs()
+    sys._MEIPASS = REPO_ROOT  # resource_path() resolves assets relative to the repo root
+    sys.path.insert(0, os.path.join(REPO_ROOT, "src"))
+    import ticketmaker
+    return ticketmaker
+
+def result(suite, name, value, unit, better="lower", **params):
+    """One machine-readable measurement; better says which direction is an improvement."""
+    return {"suite": suite, "name": name, "value": round(value, 4), "unit": unit, "better": better, "params": params}
+
+def run_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+def write_results(results, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"metadata": run_metadata(), "results": results}, f, indent=2)
+        f.write("\n")
+
+def print_results(results):
+    for entry in results:
+        print(f"{entry['suite']:<8} {entry['name']:<44} {entry['value']:>12.2f} {entry['unit']}")
+
+def run_standalone(doc, add_arguments, run):
+    """Command-line entry point shared by the bench_*.py scripts."""
+    parser = argparse.ArgumentParser(description=doc.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    args = parser.parse_args()
+    results = run(args)
+    if args.json:
+        write_results(results, args.json)
+    return results
+
+def make_screenshot(width=1600, height=900, seed=0):
+    """PNG bytes that compress like a real screenshot: flat panels, text-like runs and a photo-ish patch."""
+    from PyQt5.QtCore import QBuffer, QIODevice, QRect
+    from PyQt5.QtGui import QColor, QImage, QPainter
+
+    rng = random.Random(seed)
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(240, 240, 240))
+    painter = QPainter(image)
+    painter.fillRect(QRect(0, 0, width, 40), QColor(45, 45, 48))
+    for y in range(60, height - 40, 22):
+        x = 20
+        while x < width // 2:
+            run = rng.randint(15, 90)
+            painter.fillRect(QRect(x, y, run, 10), QColor(rng.randint(0, 80), rng.randint(0, 80), rng.randint(0, 80)))
+            x += run + rng.randint(5, 14)
+    patch_width, patch_height = min(480, width // 3), min(400, height // 2)
+    noise = rng.randbytes(patch_width * patch_height * 4)
+    painter.drawImage(width // 2 + 40, 80, QImage(noise, patch_width, patch_height, QImage.Format_RGB32))
+    painter.end()
+
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+def screenshot_html(screenshots, text="the error dialog looks like this"):
+    """Editor-style HTML with a paragraph before each pasted PNG."""
+    parts = []
+    for idx, png in enumerate(screenshots):
+        encoded = base64.b64encode(png).decode("ascii")
+        parts.append(f"<p>Step {idx + 1}: {text}</p>")
+        parts.append(f'<img src="data:image/png;base64,{encoded}" style="max-width: 100%;">')
+    return "".join(parts)
@@ -0,0 +1,87 @@
+"""
+Run the benchmark suites and save machine-readable results for tracking regressions.
+
+    python benchmarks/run.py --quick --output results.json
+    python benchmarks/run.py --baseline results.json --threshold 0.15
+
+Each suite runs with its own defaults (or its QUICK_ARGS with --quick). With --baseline,
+every result that got worse by more than the threshold is reported and the exit status is 1.
+"""
+import argparse
+import json
+import sys
+
+import bench_client
+import bench_compact
+import bench_extract
+import bench_ingest
+import bench_metadata
+import bench_payload
+import bench_ratelimit
+import bench_send
+from harness import print_results, write_results
+
+SUITES = {
+    "extract": bench_extract,
+    "payload": bench_payload,
+    "compact": bench_compact,
+    "client": bench_client,
+    "metadata": bench_metadata,
+    "send": bench_send,
+    "ingest": bench_ingest,
+    "ratelimit": bench_ratelimit,
+}
+
+def suite_args(module, quick):
+    parser = argparse.ArgumentParser()
+    module.add_arguments(parser)
+    return parser.parse_args(module.QUICK_ARGS if quick else [])
+
+def compare(results, baseline_path, threshold):
+    """Return (result, baseline value, relative change) for every result that regressed."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(entry["suite"], entry["name"]): entry for entry in json.load(f)["results"]}
+    regressions = []
+    for entry in results:
+        previous = baseline.get((entry["suite"], entry["name"]))
+        if not previous or not previous["value"] or previous["params"] != entry["params"]:
+            continue
+        change = (entry["value"] - previous["value"]) / previous["value"]
+        if entry["better"] == "higher":
+            change = -change
+        if change > threshold:
+            regressions.append((entry, previous["value"], change))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("suites", nargs="*", metavar="SUITE",
+                        help=f"suites to run (default: all of {', '.join(SUITES)})")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs, for a fast smoke run")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against an earlier --output file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative change counted as a regression")
+    args = parser.parse_args()
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    results = []
+    for name in args.suites or list(SUITES):
+        print(f"== {name}")
+        results += SUITES[name].run(suite_args(SUITES[name], args.quick))
+    print("== results")
+    print_results(results)
+    if args.output:
+        write_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.threshold)
+        for entry, previous, change in regressions:
+            print(f"REGRESSION {entry['suite']} {entry['name']}: {previous:.2f} -> {entry['value']:.2f} "
+                  f"{entry['unit']} ({change * 100:.0f}% worse)")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
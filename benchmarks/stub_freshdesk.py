@@ -0,0 +1,204 @@
+"""
+Local stand-in for the Freshdesk ticket API.
+
+Speaks HTTP/1.1 with keep-alive so client connection reuse is visible, and can optionally
+serve TLS with a throwaway self-signed certificate so handshake costs are measured too.
+Every Nth request can be answered with a 429 (with Retry-After) or a 503 to exercise the
+client's retry paths. With a per-window limit, ticket POSTs carry X-RateLimit-Total and
+X-RateLimit-Remaining like Freshdesk's and get a 429 once the fixed window is used up. GET ticket_fields and contacts are served with an ETag and honor
+If-None-Match, for the metadata cache; GET tickets pages through the tickets list.
+"""
+import collections
+import datetime
+import ipaddress
+import json
+import math
+import os
+import ssl
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+TICKET_FIELDS = [
+    {"name": "priority", "choices": {"Low": 1, "Medium": 2, "High": 3, "Urgent": 4}},
+    {"name": "status", "choices": {"2": ["Open", "Being Processed"], "3": ["Pending", "Awaiting your Reply"],
+                                   "4": ["Resolved", "This ticket has been Resolved"],
+                                   "5": ["Closed", "This ticket has been Closed"],
+                                   "6": ["Waiting on Customer", "Awaiting your Reply"]}},
+]
+
+def create_self_signed_cert(directory):
+    """Write a localhost certificate and key into directory and return (cert_path, key_path)."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "stub-cert.pem")
+    key_path = os.path.join(directory, "stub-key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()))
+    return cert_path, key_path
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        stub = self.server.stub
+        length = int(self.headers.get("Content-Length", 0))
+        remaining = length
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+        if stub.latency:
+            time.sleep(stub.latency)
+        status, headers, body = stub.next_response(self.path, length)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        status, headers, body = self.server.stub.get_response(self.path, self.headers)
+        payload = json.dumps(body).encode("utf-8") if status != 304 else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubFreshdesk:
+    """Threaded stub server answering POST /api/v2/tickets with 201 Created."""
+
+    def __init__(self, latency=0.0, tls=False, rate_limit_every=0, error_every=0, retry_after=1,
+                 rate_limit_per_window=0, window=60):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_per_window = rate_limit_per_window
+        self.window = window
+        self.window_started = time.monotonic()
+        self.window_used = 0
+        self.error_every = error_every
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.next_id = 1
+        self.requests = 0
+        self.bytes_received = 0
+        self.statuses = collections.Counter()
+        self.contacts = []
+        self.tickets = []
+        self.metadata_version = 1
+        self.cert_path = None
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        if tls:
+            self.cert_path, key_path = create_self_signed_cert(tempfile.mkdtemp(prefix="stub-freshdesk-"))
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert_path, key_path)
+            self.server.socket = context.wrap_socket(self.server.socket, server_side=True)
+        self.scheme = "https" if tls else "http"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def api_url(self):
+        host, port = self.server.server_address
+        return f"{self.scheme}://{host}:{port}"
+
+    def next_response(self, path, length):
+        """Return (status, headers, json body) for one request."""
+        with self.lock:
+            self.requests += 1
+            self.bytes_received += length
+            if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+                self.statuses[429] += 1
+                return 429, {"Retry-After": str(self.retry_after)}, {"message": "You have exceeded the limit of requests per minute"}
+            limit_headers = {}
+            if self.rate_limit_per_window:
+                now = time.monotonic()
+                if now - self.window_started >= self.window:
+                    self.window_started, self.window_used = now, 0
+                if self.window_used >= self.rate_limit_per_window:
+                    self.statuses[429] += 1
+                    retry_after = max(1, math.ceil(self.window_started + self.window - now))
+                    return 429, {"Retry-After": str(retry_after), "X-RateLimit-Total": str(self.rate_limit_per_window),
+                                 "X-RateLimit-Remaining": "0"}, {"message": "You have exceeded the limit of requests per minute"}
+                self.window_used += 1
+                limit_headers = {"X-RateLimit-Total": str(self.rate_limit_per_window),
+                                 "X-RateLimit-Remaining": str(self.rate_limit_per_window - self.window_used)}
+            if self.error_every and self.requests % self.error_every == 0:
+                self.statuses[503] += 1
+                return 503, {}, {"message": "Service temporarily unavailable"}
+            self.statuses[201] += 1
+            ticket_id = self.next_id
+            self.next_id += 1
+        return 201, limit_headers, {"id": ticket_id, "status": 2}
+
+    def get_response(self, path, headers):
+        """Return (status, headers, json body) for a metadata GET."""
+        url = urlparse(path)
+        etag = f'"v{self.metadata_version}"'
+        with self.lock:
+            self.requests += 1
+        if url.path.endswith("/ticket_fields"):
+            body = TICKET_FIELDS
+        elif url.path.endswith("/tickets"):
+            query = parse_qs(url.query)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            return 200, {}, self.tickets[(page - 1) * per_page:page * per_page]
+        elif url.path.endswith("/contacts"):
+            query = parse_qs(url.query)
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            body = self.contacts[(page - 1) * per_page:page * per_page]
+            if page * per_page < len(self.contacts):
+                etag_headers = {"ETag": etag, "Link": f'<{path}>; rel="next"'}
+                if page == 1 and headers.get("If-None-Match") == etag:
+                    return 304, {"ETag": etag}, None
+                return 200, etag_headers, body
+        else:
+            return 404, {}, {"message": "Not found"}
+        if headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, None
+        return 200, {"ETag": etag}, body
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
@@ -1,38 +1,260 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import sys
 import os
 import json
 import re
 import base64
+import binascii
+import mmap
+import uuid
 import winreg
+import msvcrt
 import logging
+import logging.handlers
+import queue
+import atexit
+import threading
+import csv
+import argparse
+import getpass
+import hashlib
+import sqlite3
+import random
+import functools
+import html
+import bisect
+import contextlib
+import collections
+import math
+import calendar
+import http.server
+import asyncio
+import hmac
+import errno
+import secrets
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from ctypes import Structure, c_uint, POINTER, windll, create_string_buffer, byref, cast, c_void_p, string_at
 from ctypes.wintypes import DWORD
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QLabel, QLineEdit, QComboBox,
     QPushButton, QWidget, QMessageBox, QFileDialog, QSystemTrayIcon, QMenu,
-    QSplashScreen, QInputDialog
+    QSplashScreen, QInputDialog, QProgressBar, QHBoxLayout, QDialog, QTableWidget,
+    QTableWidgetItem, QCompleter, QTableView, QHeaderView, QTextEdit
 )
-from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import QUrl, Qt
-from PyQt5.QtGui import QIcon, QPixmap, QPalette, QColor
-from freshdesk.api import API
+from PyQt5.QtCore import QUrl, Qt, QCoreApplication, QObject, QAbstractTableModel, QModelIndex, QRunnable, QThreadPool, QTimer, QBuffer, QIODevice, QStringListModel, pyqtSignal, pyqtSlot
+from PyQt5.QtGui import QIcon, QPixmap, QPalette, QColor, QImage, QDesktopServices, QTextDocument
+from PyQt5.QtNetwork import QLocalServer, QLocalSocket
 import requests
+from requests.adapters import HTTPAdapter
 
 # File paths for logs and encrypted credentials
-STORAGE_PATH = r"C:\ProgramData\TicketMaker"
+STORAGE_PATH = os.getenv("TICKETMAKER_STORAGE_PATH", r"C:\ProgramData\TicketMaker")
 LOG_FILE = os.path.join(STORAGE_PATH, "ticketmaker.log")
 URL_FILE = os.path.join(STORAGE_PATH, "FreshdeskURL.dat")
 APIKEY_FILE = os.path.join(STORAGE_PATH, "FreshdeskAPIKey.dat")
-
-# Set up logging to write to both a file and the console
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO").upper(),
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
+OUTBOX_FILE = os.path.join(STORAGE_PATH, f"outbox-{getpass.getuser()}.db")
+METRICS_FILE = os.path.join(STORAGE_PATH, "metrics.jsonl")
+DRAFTS_PATH = os.path.join(STORAGE_PATH, "drafts", getpass.getuser())
+METADATA_PATH = os.path.join(STORAGE_PATH, "metadata")
+HISTORY_FILE = os.path.join(STORAGE_PATH, f"history-{getpass.getuser()}.db")
+
+# Upload tuning for background ticket submissions
+UPLOAD_CHUNK_SIZE = 64 * 1024
+FRESHDESK_ATTACHMENT_LIMIT = 20 * 1024 * 1024  # total per ticket
+MAX_CONCURRENT_SUBMISSIONS = 2
+
+# Freshdesk HTTP client tuning (timeouts in seconds)
+HTTP_POOL_SIZE = 8
+HTTP_CONNECT_TIMEOUT = 10
+HTTP_READ_TIMEOUT = 60
+
+# Client-side pacing shared by every Freshdesk request on this machine (Freshdesk limits are per minute)
+RATE_LIMIT_FILE = os.path.join(STORAGE_PATH, "ratelimit.json")
+RATE_LIMIT_WINDOW = 60
+RATE_LIMIT_TARGET = 0.9  # fraction of the plan limit to use
+RATE_LIMIT_BURST = 0.1   # bucket size as a fraction of the plan limit
+RATE_LIMIT_MAX_WAIT = 30  # seconds an app request waits before the outbox reschedules it
+
+# Offline outbox retry policy (seconds)
+OUTBOX_BATCH_SIZE = MAX_CONCURRENT_SUBMISSIONS
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 300
+OUTBOX_MAX_SLEEP = 60
+
+# Submission timing metrics (the Prometheus endpoint is off unless a port is set)
+METRICS_HISTORY = 50
+METRICS_MAX_BYTES = 5 * 1024 * 1024
+METRICS_PORT = int(os.getenv("TICKETMAKER_METRICS_PORT", "0"))
+SUBMISSION_PHASES = [
+    "editor_content", "extract_images", "compact_html", "validate", "prepare_images", "enqueue", "queue_wait",
+    "failed_attempts", "attachments", "build_body", "rate_limit", "upload", "freshdesk", "total",
+]
+
+# Pasted screenshot optimization
+IMAGE_MAX_DIMENSION = int(os.getenv("TICKETMAKER_IMAGE_MAX_DIMENSION", "1920"))
+IMAGE_JPEG_QUALITY = 85
+IMAGE_OPTIMIZE_MIN_BYTES = 32 * 1024
+IMAGE_OPTIMIZER_PROCESSES = max(1, min(4, (os.cpu_count() or 2) - 1))
+image_pool = None
+image_pool_lock = threading.Lock()
+
+# Freshdesk priority and status values
+PRIORITIES = {"low": 1, "medium": 2, "high": 3, "urgent": 4}
+STATUSES = {"open": 2, "pending": 3, "resolved": 4, "closed": 5}
+
+# Freshdesk metadata cache (seconds) and email autocomplete
+TICKET_FIELDS_TTL = 24 * 60 * 60
+CONTACTS_TTL = 6 * 60 * 60
+CONTACTS_SYNC_OVERLAP = 5 * 60
+CONTACTS_PAGE_SIZE = 100
+CONTACTS_MAX_PAGES = 1000
+METADATA_REFRESH_INTERVAL = 60 * 60
+EMAIL_COMPLETIONS = 10
+
+# Duplicate detection over recently updated open tickets
+DUPLICATE_INDEX_DAYS = 30
+DUPLICATE_INDEX_MAX_TICKETS = 20000
+DUPLICATE_DESCRIPTION_TOKENS = 40
+DUPLICATE_MIN_SCORE = 0.6
+DUPLICATE_MAX_RESULTS = 3
+DUPLICATE_CHECK_DELAY_MS = 150
+DUPLICATE_SYNC_INTERVAL = 5 * 60
+TICKETS_PAGE_SIZE = 100
+TICKETS_MAX_PAGES = 300
+CLOSED_STATUSES = (4, 5)
+
+# "My Tickets" rows read per scroll step
+HISTORY_PAGE_SIZE = 200
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'_-]*[a-z0-9]")
+HTML_TAG_RE = re.compile(r"<[^>]*>")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by can cannot could do does for from has have how i in is it its my no not "
+    "of on or our please the this to was we were what when with won't you your".split()
 )
+
+# Draft autosave waits this long after the last edit
+DRAFT_SAVE_DELAY_MS = 1500
+
+# Editor backend: "web" (QtWebEngine) or "text" (QTextEdit, no Chromium renderer)
+EDITOR_BACKEND = os.getenv("TICKETMAKER_EDITOR", "web").strip().lower()
+TEXT_EDITOR_IMAGE_SCHEME = "tm-image"
+# Minutes the window stays hidden before the web editor's renderer is released (0 keeps it)
+EDITOR_IDLE_RELEASE_MINUTES = float(os.getenv("TICKETMAKER_EDITOR_IDLE_MINUTES", "15"))
+
+# Single-instance handoff
+INSTANCE_SERVER_NAME = f"TicketMaker-{getpass.getuser()}"
+INSTANCE_CONNECT_TIMEOUT_MS = 250
+
+# Headless bulk import
+BULK_IMPORT_WORKERS = 4
+BULK_IMPORT_MAX_ATTEMPTS = 5
+
+# Loopback ingestion API for local scripts (off unless a port is set). Without
+# TICKETMAKER_INGEST_TOKEN a per-user token is generated into the user's own profile.
+INGEST_PORT = int(os.getenv("TICKETMAKER_INGEST_PORT", "0"))
+INGEST_TOKEN = os.getenv("TICKETMAKER_INGEST_TOKEN", "")
+INGEST_TOKEN_FILE = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), "TicketMaker", "ingest-token")
+INGEST_DEFAULTS = {"email": None, "priority": "low", "status": "open"}
+INGEST_MAX_BODY = 30 * 1024 * 1024
+INGEST_WORKERS = 4
+INGEST_BATCH_SIZE = 500
+INGEST_RESULTS_KEPT = 10000
+
+# Log file rotation and record size limits
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_MESSAGE_LIMIT = 4096
+
+# Secrets are replaced before a record reaches any handler
+LOG_SECRET_PATTERNS = [
+    re.compile(r"""(authorization['"]?\s*[:=]\s*['"]?(?:basic|bearer|token)?\s*)[^\s'",}]+""", re.IGNORECASE),
+    re.compile(r"""(api[_-]?key['"]?\s*[:=]\s*['"]?)[^\s'",}]+""", re.IGNORECASE),
+]
+LOG_DATA_URI_RE = re.compile(r"(data:[\w/+.-]+;base64,)[A-Za-z0-9+/=\s]{64,}")
+log_secrets = ()
+
+def register_log_secret(secret):
+    """Redact this exact value (and its Basic auth form) from every later log record."""
+    global log_secrets
+    if secret:
+        basic = base64.b64encode(f"{secret}:X".encode()).decode("ascii")
+        log_secrets = log_secrets + (secret, basic)
+
+def sanitize_log_message(message):
+    """Redact secrets and shrink bulky content so one record stays small."""
+    for secret in log_secrets:
+        message = message.replace(secret, "[REDACTED]")
+    for pattern in LOG_SECRET_PATTERNS:
+        message = pattern.sub(r"\1[REDACTED]", message)
+    message = LOG_DATA_URI_RE.sub(
+        lambda match: f"{match.group(1)}<{len(match.group(0))} chars, sha256 "
+                      f"{hashlib.sha256(match.group(0).encode()).hexdigest()[:12]}>", message)
+    if len(message) > LOG_MESSAGE_LIMIT:
+        rest = message[LOG_MESSAGE_LIMIT:]
+        message = (f"{message[:LOG_MESSAGE_LIMIT]}... [{len(rest)} more chars, "
+                   f"sha256 {hashlib.sha256(rest.encode()).hexdigest()[:12]}]")
+    return message
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line, for the rotating log file."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records untouched; formatting happens on the listener thread."""
+
+    def prepare(self, record):
+        return record
+
+class LogListener(logging.handlers.QueueListener):
+    """Writes queued records from a background thread so logging never blocks the UI."""
+
+    def prepare(self, record):
+        record.msg = sanitize_log_message(record.getMessage())
+        record.args = None
+        # Tracebacks are formatted and redacted here once, so no handler sees the raw ones
+        if record.exc_info:
+            record.exc_text = sanitize_log_message(logging.Formatter().formatException(record.exc_info))
+            record.exc_info = None
+        elif record.exc_text:
+            record.exc_text = sanitize_log_message(record.exc_text)
+        if record.stack_info:
+            record.stack_info = sanitize_log_message(record.stack_info)
+        return record
+
+def setup_logging():
+    """Send all logging through a queue to a rotating JSON-lines file and the console."""
+    os.makedirs(STORAGE_PATH, exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        LOG_FILE, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+    file_handler.setFormatter(JsonLogFormatter())
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    root.addHandler(LogQueueHandler(log_queue))
+    listener = LogListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
 def resource_path(relative_path):
@@ -84,9 +306,12 @@ def sanitize_credential(credential):
     """Clean up credentials by removing unexpected characters."""
     return credential.strip().replace("\x00", "")
 
+@functools.lru_cache(maxsize=None)
 def load_credentials():
     """
     Load and decrypt Freshdesk credentials using DPAPI.
+
+    The result is cached, so DPAPI is only called once per process.
     """
     try:
         # Read and decrypt Freshdesk URL
@@ -99,24 +324,16 @@ def load_credentials():
         with open(APIKEY_FILE, "r") as f:
             encrypted_apikey = base64.b64decode(f.read())
             freshdesk_apikey = decrypt_with_dpapi(encrypted_apikey)
-            logger.info(f"Decrypted Freshdesk API Key: {freshdesk_apikey}")
 
-        return sanitize_credential(freshdesk_url), sanitize_credential(freshdesk_apikey)
+        freshdesk_apikey = sanitize_credential(freshdesk_apikey)
+        register_log_secret(freshdesk_apikey)
+        logger.info("Decrypted Freshdesk API key")
+        return sanitize_credential(freshdesk_url), freshdesk_apikey
 
     except Exception as e:
         logger.error(f"Failed to load credentials: {e}")
         return None, None
 
-# Retrieve the Freshdesk URL and API Key
-url, api_key = load_credentials()
-
-if url and api_key:
-    logger.info(f"Freshdesk URL: {url}")
-    logger.info(f"Freshdesk API Key: {api_key}")
-else:
-    logger.critical("Failed to retrieve Freshdesk credentials. Exiting.")
-    sys.exit(1)  # Exit the app if credentials are missing
-
 def is_windows_dark_mode():
     """Detect if Windows is in dark mode."""
     try:
@@ -128,16 +345,2871 @@ def is_windows_dark_mode():
         logger.warning(f"Dark mode detection failed: {e}")
         return False
 
+# An <img> tag, allowing ">" inside quoted attribute values
+IMG_TAG_RE = re.compile(r"""<img\b(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+SRC_ATTR_RE = re.compile(r"""\ssrc\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+ALT_ATTR_RE = re.compile(r"""\salt\s*=""", re.IGNORECASE)
+EMBEDDED_ATTR_RE = re.compile(r'\sdata-embedded-image\s*=\s*"([^"]*)"', re.IGNORECASE)
+STAGED_ATTR_RE = re.compile(r'\sdata-tm-image\s*=\s*"([^"]*)"', re.IGNORECASE)
+IMAGE_EXTENSIONS = {"jpeg": "jpg", "svg+xml": "svg", "x-icon": "ico", "vnd.microsoft.icon": "ico"}
+IMAGE_MIME_TYPES = {"jpg": "image/jpeg", "svg": "image/svg+xml", "ico": "image/x-icon"}
+
+# Description HTML compaction: the markup a pasted Outlook, Word or web page fragment keeps
+COMPACT_ALLOWED_TAGS = {
+    "a", "b", "strong", "i", "em", "u", "s", "strike", "sub", "sup", "code", "span",
+    "p", "div", "br", "hr", "blockquote", "pre", "ul", "ol", "li", "img",
+    "h1", "h2", "h3", "h4", "h5", "h6", "table", "thead", "tbody", "tr", "th", "td",
+}
+COMPACT_ALLOWED_ATTRIBUTES = {
+    "a": {"href"},
+    "img": {"src", "alt", "width", "height", "data-embedded-image", "data-tm-image"},
+    "ol": {"start"},
+    "td": {"colspan", "rowspan"},
+    "th": {"colspan", "rowspan"},
+}
+COMPACT_ALLOWED_STYLES = {"color", "background-color", "font-weight", "font-style", "text-decoration", "text-align"}
+COMPACT_DEFAULT_STYLES = {
+    "color": {"windowtext", "black", "#000", "#000000", "rgb(0, 0, 0)", "inherit", "initial"},
+    "background-color": {"transparent", "inherit", "initial"},
+    "font-weight": {"normal", "400", "inherit", "initial"},
+    "font-style": {"normal", "inherit", "initial"},
+    "text-decoration": {"none", "inherit", "initial"},
+    "text-align": {"left", "start", "inherit", "initial"},
+}
+COMPACT_DROP_CONTENT = {"head", "script", "style", "title", "xml", "template", "noscript", "iframe", "object"}
+COMPACT_VOID_TAGS = {"br", "hr", "img"}
+COMPACT_BLOCK_TAGS = {
+    "p", "div", "br", "hr", "blockquote", "pre", "ul", "ol", "li",
+    "h1", "h2", "h3", "h4", "h5", "h6", "table", "thead", "tbody", "tr", "th", "td",
+}
+COMPACT_URL_SCHEMES = {"http", "https", "mailto", "tel", "cid", "data"}
+COMPACT_WHITESPACE_RE = re.compile(r"[ \t\r\n\f]+")
+COMPACT_BOLD_RESET_RE = re.compile(r"font-weight\s*:\s*(?:normal|400)\b", re.IGNORECASE)
+COMPACT_EMPTY_INLINE_RE = re.compile(r"<(span|b|strong|i|em|u|s|strike|sub|sup|code|a)(?: [^>]*)?></\1>")
+
+# Soft budget for the ticket body; bigger descriptions are sent but logged as a warning
+DESCRIPTION_BUDGET_BYTES = 512 * 1024
+
+def decode_data_uri(uri):
+    """Return (mime subtype, bytes) for a base64 data:image URI, or None if it is anything else."""
+    if not uri[:11].lower() == "data:image/":
+        return None
+    header, separator, payload = uri.partition(",")
+    params = header[11:].split(";")
+    if not separator or "base64" not in (param.strip().lower() for param in params[1:]):
+        return None
+    if any(char.isspace() for char in payload[:128]):
+        payload = "".join(payload.split())
+    payload += "=" * (-len(payload) % 4)
+    try:
+        return params[0].strip().lower(), base64.b64decode(payload)
+    except (ValueError, binascii.Error):
+        return None
+
+class UnresolvedImage(ValueError):
+    """Raised when a data-tm-image placeholder has neither staged bytes nor a src to fall back on."""
+
+def extract_embedded_images(description, staged_image=None):
+    """
+    Pull base64 data-URI images out of editor HTML in a single pass.
+
+    Returns the description with each embedded <img> rewritten to a lightweight reference,
+    plus a list of (file name, bytes) attachments decoded straight into memory. Attribute
+    order, quoting style and image type do not matter. Tags carrying a data-tm-image
+    placeholder are resolved through staged_image(id), which returns (mime subtype, bytes)
+    for images the editor bridge already received at paste time; a placeholder it cannot
+    resolve and that has no src left raises UnresolvedImage rather than losing the image.
+    """
+    images = []
+
+    def replace_tag(match):
+        tag = match.group(0)
+        placeholder = STAGED_ATTR_RE.search(tag)
+        decoded = None
+        if placeholder:
+            tag = tag[:placeholder.start()] + tag[placeholder.end():]
+            if staged_image is not None:
+                decoded = staged_image(placeholder.group(1))
+        src = SRC_ATTR_RE.search(tag)
+        if decoded is None:
+            if not src:
+                if placeholder and staged_image is not None:
+                    raise UnresolvedImage(f"Pasted image {placeholder.group(1)} was not staged")
+                return tag
+            decoded = decode_data_uri(next(value for value in src.groups() if value is not None))
+            if decoded is None:
+                return tag
+        subtype, content = decoded
+        extension = IMAGE_EXTENSIONS.get(subtype, re.sub(r"[^a-z0-9]", "", subtype) or "img")
+        name = f"embedded_image_{len(images) + 1}.{extension}"
+        images.append((name, content))
+
+        rewritten = tag[:src.start()] + tag[src.end():] if src else tag
+        closing = "/>" if rewritten.endswith("/>") else ">"
+        attributes = f' data-embedded-image="{name}"'
+        if not ALT_ATTR_RE.search(rewritten):
+            attributes = f' alt="{name}"' + attributes
+        return rewritten[:-len(closing)].rstrip() + attributes + closing
+
+    return IMG_TAG_RE.sub(replace_tag, description), images
+
+def inline_embedded_images(description, images):
+    """Reverse extract_embedded_images(): put (file name, bytes) images back as data URIs."""
+    by_name = dict(images)
+
+    def restore_tag(match):
+        tag = match.group(0)
+        reference = EMBEDDED_ATTR_RE.search(tag)
+        if not reference or reference.group(1) not in by_name:
+            return tag
+        name = reference.group(1)
+        extension = name.rsplit(".", 1)[-1].lower()
+        mime = IMAGE_MIME_TYPES.get(extension, f"image/{extension}")
+        encoded = base64.b64encode(by_name[name]).decode("ascii")
+        return tag[:reference.start()] + f' src="data:{mime};base64,{encoded}"' + tag[reference.end():]
+
+    return IMG_TAG_RE.sub(restore_tag, description)
+
+def inline_draft_images(description, images):
+    """Give data-tm-image placeholders their data URI back from {id: (mime subtype, bytes)}."""
+
+    def restore_tag(match):
+        tag = match.group(0)
+        placeholder = STAGED_ATTR_RE.search(tag)
+        if not placeholder or placeholder.group(1) not in images or SRC_ATTR_RE.search(tag):
+            return tag
+        subtype, content = images[placeholder.group(1)]
+        encoded = base64.b64encode(content).decode("ascii")
+        return tag[:placeholder.end()] + f' src="data:image/{subtype};base64,{encoded}"' + tag[placeholder.end():]
+
+    return IMG_TAG_RE.sub(restore_tag, description)
+
+def rename_embedded_images(description, renames):
+    """Point data-embedded-image references (and matching alt text) at new attachment names."""
+    if not renames:
+        return description
+
+    def rename_tag(match):
+        tag = match.group(0)
+        reference = EMBEDDED_ATTR_RE.search(tag)
+        if not reference or reference.group(1) not in renames:
+            return tag
+        return tag.replace(f'"{reference.group(1)}"', f'"{renames[reference.group(1)]}"')
+
+    return IMG_TAG_RE.sub(rename_tag, description)
+
+def compact_style(value):
+    """Keep the allowed, non-default declarations of a style attribute."""
+    declarations = []
+    for declaration in value.split(";"):
+        name, separator, setting = declaration.partition(":")
+        name = name.strip().lower()
+        setting = " ".join(setting.replace("!important", "").split())
+        if separator and name in COMPACT_ALLOWED_STYLES and setting and \
+                setting.lower() not in COMPACT_DEFAULT_STYLES[name]:
+            declarations.append(f"{name}: {setting}")
+    return "; ".join(declarations)
+
+def is_safe_url(value):
+    scheme, separator, _ = value.partition(":")
+    return not separator or "/" in scheme or scheme.strip().lower() in COMPACT_URL_SCHEMES
+
+class HtmlCompactor(HTMLParser):
+    """
+    Rewrite description HTML down to COMPACT_ALLOWED_TAGS in one streaming pass.
+
+    Disallowed tags (Outlook's <o:p>, <font>, bare <span>s) are unwrapped to their text,
+    <head>/<style>/<script> and comments are dropped with their content, attributes and
+    styles are cut to the allow-lists and runs of whitespace collapse to one space.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.stack = []  # (tag, kept)
+        self.skipping = None
+        self.preformatted = 0
+        self.after_block = True
+
+    def handle_starttag(self, tag, attrs):
+        if self.skipping:
+            return
+        if tag in COMPACT_DROP_CONTENT:
+            self.skipping = tag
+            return
+        kept = tag in COMPACT_ALLOWED_TAGS
+        attributes = []
+        if kept:
+            allowed = COMPACT_ALLOWED_ATTRIBUTES.get(tag, ())
+            for name, value in attrs:
+                value = value or ""
+                if name == "style":
+                    if tag in ("b", "strong") and COMPACT_BOLD_RESET_RE.search(value):
+                        kept = False  # Google Docs wraps whole pastes in <b style="font-weight:normal">
+                    value = compact_style(value)
+                elif name not in allowed or (name in ("href", "src") and not is_safe_url(value)):
+                    continue
+                if value:
+                    attributes.append(f' {name}="{html.escape(value)}"')
+            if tag == "span" and not attributes:
+                kept = False
+        if kept:
+            if tag in COMPACT_BLOCK_TAGS:
+                self.block_boundary()
+            self.parts.append(f"<{tag}{''.join(attributes)}>")
+        if tag in COMPACT_VOID_TAGS:
+            return
+        if tag == "pre":
+            self.preformatted += 1
+        self.stack.append((tag, kept))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in COMPACT_VOID_TAGS and not self.skipping:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.skipping:
+            if tag == self.skipping:
+                self.skipping = None
+            return
+        if not any(open_tag == tag for open_tag, _ in self.stack):
+            return
+        while self.stack:
+            open_tag, kept = self.stack.pop()
+            if open_tag == "pre":
+                self.preformatted -= 1
+            if kept:
+                if open_tag in COMPACT_BLOCK_TAGS:
+                    self.block_boundary()
+                self.parts.append(f"</{open_tag}>")
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.skipping:
+            return
+        if not self.preformatted:
+            data = COMPACT_WHITESPACE_RE.sub(" ", data)
+            if self.after_block:
+                data = data.lstrip(" ")
+            if not data:
+                return
+        self.after_block = False
+        self.parts.append(html.escape(data, quote=False).replace("\xa0", "&nbsp;"))
+
+    def block_boundary(self):
+        """Whitespace next to a block tag renders as nothing, so drop it."""
+        self.after_block = True
+        if self.parts and not self.preformatted and self.parts[-1].endswith(" "):
+            self.parts[-1] = self.parts[-1].rstrip(" ")
+
+    def close(self):
+        super().close()
+        while self.stack:
+            tag, kept = self.stack.pop()
+            if kept:
+                self.parts.append(f"</{tag}>")
+        return "".join(self.parts)
+
+def compact_html(description):
+    """
+    Strip pasted description HTML down to what Freshdesk renders.
+
+    Returns the description unchanged when it cannot be parsed.
+    """
+    try:
+        compactor = HtmlCompactor()
+        compactor.feed(description)
+        compacted = compactor.close()
+    except Exception as e:
+        logger.warning(f"HTML compaction failed, sending the description as is: {e}")
+        return description
+    previous = None
+    while previous != compacted:
+        previous, compacted = compacted, COMPACT_EMPTY_INLINE_RE.sub("", compacted)
+    return compacted
+
+def is_blank_html(description):
+    """True when editor HTML (a web fragment or a whole QTextEdit document) has no text and no images."""
+    if re.search(r"<img\b", description, re.IGNORECASE):
+        return False
+    text = re.sub(r"<(head|style|script|title)\b.*?</\1\s*>|<[^>]*>", "", description, flags=re.IGNORECASE | re.DOTALL)
+    return not html.unescape(text).strip()
+
+def is_opaque(image):
+    """True if a QImage has no pixel with any transparency."""
+    if not image.hasAlphaChannel():
+        return True
+    alpha = image.convertToFormat(QImage.Format_Alpha8)
+    bits = alpha.constBits()
+    bits.setsize(alpha.sizeInBytes())
+    data = bytes(bits)
+    row_bytes = alpha.bytesPerLine()
+    width = alpha.width()
+    return all(data.count(255, row, row + width) == width for row in range(0, len(data), row_bytes))
+
+def optimize_image(name, content, max_dimension, jpeg_quality):
+    """
+    Downscale one image and re-encode it to the smallest of PNG or JPEG.
+
+    Runs in a worker process. Returns (name, content) with the extension matching the new
+    format, or the input unchanged when it cannot be decoded or nothing smaller comes out.
+    """
+    stem, _, extension = name.rpartition(".")
+    if extension.lower() in ("gif", "svg", "ico") or len(content) < IMAGE_OPTIMIZE_MIN_BYTES:
+        return name, content  # animations, vectors and tiny images are not worth touching
+
+    image = QImage()
+    if not image.loadFromData(content):
+        return name, content
+    if max(image.width(), image.height()) > max_dimension:
+        image = image.scaled(max_dimension, max_dimension, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+    formats = [("PNG", "png", -1)]
+    if is_opaque(image):
+        formats.append(("JPG", "jpg", jpeg_quality))
+    best_name, best_content = name, content
+    for image_format, new_extension, quality in formats:
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        if image.save(buffer, image_format, quality) and buffer.size() < len(best_content):
+            best_name, best_content = f"{stem}.{new_extension}", bytes(buffer.data())
+    return best_name, best_content
+
+def get_image_pool():
+    """Process pool for image optimization, created on first use."""
+    global image_pool
+    # Bulk import, the ingestion API and the form all prepare images on their own threads
+    with image_pool_lock:
+        if image_pool is None:
+            image_pool = ProcessPoolExecutor(max_workers=IMAGE_OPTIMIZER_PROCESSES)
+        return image_pool
+
+def optimize_images(images, max_dimension=IMAGE_MAX_DIMENSION, jpeg_quality=IMAGE_JPEG_QUALITY):
+    """
+    Prepare (name, bytes) embedded images for upload.
+
+    Duplicates are dropped by SHA-256 of their content, then the remaining images are
+    optimized in parallel in the process pool. Returns (images, {old name: new name}, bytes saved).
+    """
+    unique = []
+    renames = {}
+    seen = {}
+    for name, content in images:
+        digest = hashlib.sha256(content).digest()
+        if digest in seen:
+            renames[name] = seen[digest]
+            continue
+        seen[digest] = name
+        unique.append((name, content))
+
+    try:
+        pool = get_image_pool()
+        futures = [pool.submit(optimize_image, name, content, max_dimension, jpeg_quality) for name, content in unique]
+        optimized = [future.result() for future in futures]
+    except Exception as e:
+        logger.warning(f"Image optimization failed, uploading originals: {e}")
+        optimized = unique
+
+    for (old_name, _), (new_name, _) in zip(unique, optimized):
+        if new_name != old_name:
+            renames[old_name] = new_name
+    for old_name, kept_name in list(renames.items()):
+        renames[old_name] = renames.get(kept_name, kept_name)
+
+    saved = sum(len(content) for _, content in images) - sum(len(content) for _, content in optimized)
+    return optimized, renames, saved
+
+def prepare_embedded_images(data, attachments, images, uploads=()):
+    """
+    Optimize a ticket's embedded images, update the description to match and check the payload budget.
+
+    Shared by the GUI and headless paths; uploads are (name, bytes) files sent as they are
+    but counted in the budget. Returns (images, bytes saved).
+    """
+    optimized, renames, saved = optimize_images(images)
+    data["description"] = rename_embedded_images(data["description"], renames)
+    logger.info(f"Optimized {len(images)} embedded image(s) into {len(optimized)}, saved {saved} bytes")
+    check_payload_budget(data, [(None, path, None) for path in attachments] +
+                         [(name, None, content) for name, content in list(optimized) + list(uploads)])
+    return optimized, saved
+
+class PreparationSignals(QObject):
+    """Signals a TicketPreparation emits back to the GUI thread."""
+    prepared = pyqtSignal(object, object, int)  # ticket data, (name, bytes) images, bytes saved
+    failed = pyqtSignal(object, str)            # outbox-style entry for restoring the form, error message
+
+class TicketPreparation(QRunnable):
+    """Background worker that deduplicates and optimizes embedded images before a ticket is queued."""
+
+    def __init__(self, data, attachments, images, trace=None):
+        super().__init__()
+        self.data = data
+        self.attachments = list(attachments)
+        self.images = images
+        self.trace = trace or SubmissionTrace()
+        self.signals = PreparationSignals()
+
+    def run(self):
+        try:
+            with self.trace.span("prepare_images"):
+                images, saved = prepare_embedded_images(self.data, self.attachments, self.images)
+            self.signals.prepared.emit(self.data, images, saved)
+        except Exception as e:
+            logger.error(f"Error processing attachments: {e}")
+            entry = {
+                "data": self.data,
+                "files": [(os.path.basename(path), path, None) for path in self.attachments] +
+                         [(name, None, content) for name, content in self.images]
+            }
+            self.signals.failed.emit(entry, f"Could not process attachments or embedded images:\n{e}")
+
+class SubmissionCancelled(Exception):
+    """Raised inside a submission worker when the user cancels the upload."""
+
+def parse_choice(value, choices, field):
+    """Accept a Freshdesk numeric value or its name (e.g. "High") for priority/status."""
+    if isinstance(value, int) or str(value).strip().isdigit():
+        number = int(value)
+        if number in choices.values():
+            return number
+    elif str(value).strip().lower() in choices:
+        return choices[str(value).strip().lower()]
+    raise ValueError(f"Invalid {field} {value!r}; expected one of {', '.join(choices)}")
+
+def build_ticket_data(subject, email, description, priority, status, group_id=None, ticket_type=None):
+    """Build the Freshdesk ticket payload shared by every submission path."""
+    data = {
+        "email": email,
+        "subject": subject,
+        "description": description or "No description provided",
+        "priority": priority,  # Keep as integer
+        "status": status       # Keep as integer
+    }
+    if group_id is not None:
+        data["group_id"] = group_id
+    if ticket_type:
+        data["type"] = ticket_type
+    return data
+
+class AttachmentTooLarge(ValueError):
+    """Raised when a ticket's attachments exceed Freshdesk's total size limit."""
+
+def attachment_size(path, content):
+    """Size of one attachment, from file stats when it is a path reference."""
+    return os.stat(path).st_size if content is None else len(content)
+
+def check_attachment_sizes(files):
+    """
+    Check (name, path, content) attachments against Freshdesk's total size limit.
+
+    Only file stats are used, so nothing is read. Returns the total size in bytes.
+    """
+    total = sum(attachment_size(path, content) for _, path, content in files)
+    if total > FRESHDESK_ATTACHMENT_LIMIT:
+        raise AttachmentTooLarge(
+            f"Attachments total {total / (1024 * 1024):.1f} MB, but Freshdesk accepts at most "
+            f"{FRESHDESK_ATTACHMENT_LIMIT // (1024 * 1024)} MB per ticket."
+        )
+    return total
+
+def check_payload_budget(data, files):
+    """
+    Size a ticket's request before any network I/O: the ticket fields plus (name, path, content) attachments.
+
+    Raises AttachmentTooLarge past Freshdesk's attachment limit. Returns (body bytes, attachment bytes).
+    """
+    body = len(json.dumps(data).encode("utf-8"))
+    attachments = check_attachment_sizes(files)
+    logger.info(f"Payload budget: {body / 1024:.1f} KB ticket body + {attachments / (1024 * 1024):.1f} MB "
+                f"of {FRESHDESK_ATTACHMENT_LIMIT // (1024 * 1024)} MB attachments")
+    if body > DESCRIPTION_BUDGET_BYTES:
+        logger.warning(f"Ticket body is {body / 1024:.0f} KB, over the {DESCRIPTION_BUDGET_BYTES // 1024} KB budget")
+    return body, attachments
+
+class MultipartBody:
+    """
+    Streaming multipart/form-data request body.
+
+    Requests sends any iterable with a length as a fixed Content-Length body, so the
+    upload goes out chunk by chunk and each chunk can report progress or be cancelled.
+    File attachments are sized from their stats up front and memory-mapped one chunk at a
+    time while sending, so memory use does not grow with attachment size.
+    """
+
+    def __init__(self, fields, files, progress=None, is_cancelled=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.progress = progress
+        self.is_cancelled = is_cancelled
+        self.finished = None  # perf_counter() once the last byte has been handed to the socket
+
+        # Each segment is (attachment name or None, file path or None, bytes or None, size)
+        self.segments = []
+        for key, value in fields.items():
+            self.add_bytes(self.part_header(key) + str(value).encode("utf-8") + b"\r\n")
+        for file_name, path, content in files:
+            self.add_bytes(self.part_header("attachments[]", file_name))
+            self.segments.append((file_name, path, content, attachment_size(path, content)))
+            self.add_bytes(b"\r\n")
+        self.add_bytes(f"--{self.boundary}--\r\n".encode("utf-8"))
+
+    def add_bytes(self, content):
+        self.segments.append((None, None, content, len(content)))
+
+    def part_header(self, name, file_name=None):
+        """Build the boundary and headers that open one form part."""
+        disposition = f'form-data; name="{name}"'
+        header = f"--{self.boundary}\r\nContent-Disposition: {disposition}"
+        if file_name is not None:
+            safe_name = file_name.replace('"', "%22").replace("\r", "").replace("\n", "")
+            header += f'; filename="{safe_name}"\r\nContent-Type: application/octet-stream'
+        return (header + "\r\n\r\n").encode("utf-8")
+
+    def __len__(self):
+        return sum(size for _, _, _, size in self.segments)
+
+    def __iter__(self):
+        for file_name, path, content, size in self.segments:
+            if path is None:
+                yield from self.iter_chunks(file_name, content, size)
+            elif size:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if len(mapped) != size:
+                        raise OSError(f"{path} changed size while it was being uploaded")
+                    yield from self.iter_chunks(file_name, mapped, size)
+        self.finished = time.perf_counter()
+
+    def iter_chunks(self, file_name, content, size):
+        for offset in range(0, size, UPLOAD_CHUNK_SIZE):
+            if self.is_cancelled and self.is_cancelled():
+                raise SubmissionCancelled("Upload cancelled by user")
+            chunk = content[offset:offset + UPLOAD_CHUNK_SIZE]
+            yield chunk
+            if file_name is not None and self.progress:
+                self.progress(file_name, offset + len(chunk), size)
+
+class FreshdeskClient:
+    """
+    Freshdesk API v2 client that every network call goes through.
+
+    One requests.Session is kept for the life of the app so connections are pooled and
+    kept alive, and the Basic auth header is built once instead of on every request.
+    Every request is paced by the account's RateLimitGovernor; one that would wait longer
+    than rate_limit_wait seconds raises RateLimited (None waits as long as it takes).
+    """
+
+    def __init__(self, api_url, api_key, pool_size=HTTP_POOL_SIZE,
+                 timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT), rate_limit_wait=RATE_LIMIT_MAX_WAIT):
+        base_url = api_url.strip().rstrip("/")
+        if "://" not in base_url:
+            base_url = f"https://{base_url}"
+        self.base_url = f"{base_url}/api/v2"
+        self.timeout = timeout
+        self.rate_limit_wait = rate_limit_wait
+        self.governor = RateLimitGovernor(self.base_url)
+
+        credentials = f"{api_key}:X"
+        encoded_credentials = base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Basic {encoded_credentials}",
+            "Accept": "application/json",
+            "Connection": "keep-alive"
+        })
+        # Retries are handled by the outbox, so the adapter never retries on its own
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, path, throttle=True, **kwargs):
+        """Send a request to an API v2 path such as "tickets" and return the response."""
+        kwargs.setdefault("timeout", self.timeout)
+        if throttle:
+            self.governor.acquire(self.rate_limit_wait)
+        response = self.session.request(method, f"{self.base_url}/{path.lstrip('/')}", **kwargs)
+        try:
+            self.governor.observe(response)
+        except Exception as e:
+            # The request already happened; pacing bookkeeping must not turn a 201 into a failure
+            logger.warning(f"Could not record rate-limit headers: {e}")
+        return response
+
+    def create_ticket(self, data, files=None, progress=None, is_cancelled=None, trace=None):
+        """
+        Create a ticket with optional (name, path, content) attachments and return the response.
+
+        With a SubmissionTrace, the body build, upload and Freshdesk's response time are recorded.
+        """
+        trace = trace or SubmissionTrace()
+        with trace.span("build_body"):
+            if files:
+                body = MultipartBody(data, files, progress, is_cancelled)
+                headers = {"Content-Type": body.content_type}
+            else:
+                body = json.dumps(data).encode("utf-8")
+                headers = {"Content-Type": "application/json"}
+        trace.sizes["request_bytes"] = len(body)
+
+        if is_cancelled and is_cancelled():
+            raise SubmissionCancelled("Upload cancelled by user")
+        with trace.span("rate_limit"):
+            self.governor.acquire(self.rate_limit_wait)
+        started = time.perf_counter()
+        response = self.request("POST", "tickets", throttle=False, data=body, headers=headers)
+        finished = time.perf_counter()
+        # A streamed body knows when its last chunk went out; the rest is Freshdesk working
+        uploaded = getattr(body, "finished", None) or started
+        trace.add("upload", uploaded - started)
+        trace.add("freshdesk", finished - uploaded)
+        trace.status = response.status_code
+        return response
+
+    def close(self):
+        self.session.close()
+
+def parse_retry_after(value):
+    """Convert a Retry-After header (seconds or HTTP date) to a delay in seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def retry_delay(attempts, retry_after=None):
+    """Exponential backoff with jitter, never shorter than the server's Retry-After."""
+    capped = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)))
+    delay = capped / 2 + random.uniform(0, capped / 2)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+class RateLimited(requests.RequestException):
+    """Raised instead of sending when the rate-limit governor would make a request wait too long."""
+
+    def __init__(self, delay):
+        super().__init__(f"Freshdesk rate limit reached; the next request is allowed in {delay:.0f}s")
+        self.delay = delay
+
+def lock_file(handle):
+    """Block until this process holds the lock on an open lock file; other errors are raised."""
+    handle.seek(0)
+    while True:
+        try:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError as e:
+            if e.errno not in (errno.EDEADLOCK, errno.EACCES):
+                raise
+            # LK_LOCK gives up after ten one-second attempts while another process holds it
+
+def unlock_file(handle):
+    handle.seek(0)
+    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+class RateLimitGovernor:
+    """
+    Token bucket that every Freshdesk request from every TicketMaker process on this machine
+    draws from, so tools sharing an account stay just under its per-minute limit.
+
+    The plan limit is learned from X-RateLimit-Total. The bucket refills at
+    RATE_LIMIT_TARGET of it, holds at most RATE_LIMIT_BURST of it, and is pulled down to
+    what X-RateLimit-Remaining says is left (minus the same headroom), which accounts for
+    other clients on the key. A 429 empties it until Retry-After has passed. Until the
+    first response arrives the limit is unknown and requests are not paced.
+
+    The state of every account lives in one small JSON file under STORAGE_PATH, read and
+    rewritten under an OS file lock; if that file cannot be used, pacing continues in
+    memory for this process only.
+    """
+    thread_lock = threading.Lock()  # byte-range locks do not order threads of one process
+
+    def __init__(self, key, path=RATE_LIMIT_FILE):
+        self.key = key
+        self.path = path
+        self.memory = {}
+        self.shared = True
+
+    @contextlib.contextmanager
+    def state(self):
+        """This account's state, saved back when the block exits."""
+        with self.thread_lock:
+            handle = None
+            if self.shared:
+                try:
+                    handle = open(f"{self.path}.lock", "a+b")
+                    lock_file(handle)
+                except OSError as e:
+                    logger.warning(f"Rate-limit state is per process only: {e}")
+                    self.shared = False
+                    if handle is not None:
+                        handle.close()
+                        handle = None
+            try:
+                states = self.memory
+                if handle is not None:
+                    try:
+                        with open(self.path, encoding="utf-8") as f:
+                            states = json.load(f)
+                    except (OSError, ValueError):
+                        states = {}
+                state = states.setdefault(self.key, {"limit": None, "tokens": 0.0, "updated": time.time(),
+                                                     "blocked_until": 0.0})
+                before = dict(state)
+                yield state
+                self.memory = states
+                if handle is not None and state != before:
+                    try:
+                        with open(f"{self.path}.tmp", "w", encoding="utf-8") as f:
+                            json.dump(states, f)
+                        os.replace(f"{self.path}.tmp", self.path)
+                    except OSError as e:
+                        logger.warning(f"Rate-limit state is per process only: {e}")
+                        self.shared = False
+            finally:
+                if handle is not None:
+                    unlock_file(handle)
+                    handle.close()
+
+    @staticmethod
+    def refill(state, now):
+        """Add the tokens earned since the last update; returns the refill rate per second."""
+        rate = (state["limit"] or 0) * RATE_LIMIT_TARGET / RATE_LIMIT_WINDOW
+        if rate:
+            capacity = max(1.0, state["limit"] * RATE_LIMIT_BURST)
+            state["tokens"] = min(capacity, state["tokens"] + max(0.0, now - state["updated"]) * rate)
+            state["updated"] = now
+        return rate
+
+    def acquire(self, max_wait=None):
+        """Wait for a token; raise RateLimited instead if that would take longer than max_wait seconds."""
+        waited = 0.0
+        while True:
+            with self.state() as state:
+                now = time.time()
+                rate = self.refill(state, now)
+                delay = state["blocked_until"] - now
+                if delay <= 0:
+                    if not rate:
+                        return waited
+                    if state["tokens"] >= 1:
+                        state["tokens"] -= 1
+                        return waited
+                    delay = (1 - state["tokens"]) / rate
+            if max_wait is not None and waited + delay > max_wait:
+                raise RateLimited(delay)
+            pause = min(delay, 1.0)  # re-read the shared state, another process may have hit a 429
+            time.sleep(pause)
+            waited += pause
+
+    def observe(self, response):
+        """Fold a response's rate-limit headers and status into the bucket."""
+        headers = response.headers
+        try:
+            total = int(headers["X-RateLimit-Total"])
+        except (KeyError, ValueError):
+            total = None
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+        except (KeyError, ValueError):
+            remaining = None
+        if total is None and remaining is None and response.status_code != 429:
+            return
+        with self.state() as state:
+            now = time.time()
+            self.refill(state, now)
+            if total:
+                state["limit"] = total
+            if remaining is not None and state["limit"]:
+                state["tokens"] = min(state["tokens"], remaining - state["limit"] * (1 - RATE_LIMIT_TARGET))
+            if response.status_code == 429:
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                state["blocked_until"] = max(state["blocked_until"],
+                                             now + (RATE_LIMIT_WINDOW if retry_after is None else retry_after))
+                state["tokens"] = min(state["tokens"], 0.0)
+                logger.warning(f"Freshdesk rate limit hit; pausing requests for "
+                               f"{state['blocked_until'] - now:.0f}s")
+
+class Outbox:
+    """
+    Durable SQLite queue of tickets waiting to be sent to Freshdesk.
+
+    A ticket and its attachments are written in one transaction. User-selected files are
+    stored as path references; embedded images only exist in memory, so their bytes are
+    copied into the database. Form tickets that were rejected or cancelled are held rather
+    than deleted until they are restored into the form. Each Windows user has their own outbox, matching the
+    per-user single instance that drains it, so no two instances send the same row and a
+    rejected ticket is only ever restored into its author's form.
+    """
+
+    def __init__(self, path=OUTBOX_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL,
+                network_error INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                source TEXT NOT NULL DEFAULT 'form',
+                held INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS attachments (
+                ticket_id INTEGER NOT NULL REFERENCES tickets(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                path TEXT,
+                content BLOB
+            );
+            CREATE INDEX IF NOT EXISTS tickets_next_attempt ON tickets(next_attempt);
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(tickets)")}
+        if "source" not in columns:
+            # Outboxes written before API tickets existed only hold form tickets
+            self.conn.execute("ALTER TABLE tickets ADD COLUMN source TEXT NOT NULL DEFAULT 'form'")
+        if "held" not in columns:
+            self.conn.execute("ALTER TABLE tickets ADD COLUMN held INTEGER NOT NULL DEFAULT 0")
+
+    def enqueue(self, data, attachments, embedded_images, source="form"):
+        """Queue a ticket with attachment paths and (name, bytes) images; return its outbox id."""
+        return self.enqueue_many([(data, attachments, embedded_images)], source)[0]
+
+    def enqueue_many(self, tickets, source="form"):
+        """Queue (data, attachment paths, (name, bytes) images) tickets in one transaction; return their ids."""
+        now = time.time()
+        ids = []
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for data, attachments, embedded_images in tickets:
+                    cursor = self.conn.execute(
+                        "INSERT INTO tickets (data, created_at, next_attempt, source) VALUES (?, ?, ?, ?)",
+                        (json.dumps(data), now, now, source)
+                    )
+                    ticket_id = cursor.lastrowid
+                    rows = [(ticket_id, position, os.path.basename(path), path, None)
+                            for position, path in enumerate(attachments)]
+                    rows += [(ticket_id, len(attachments) + position, name, None, sqlite3.Binary(content))
+                             for position, (name, content) in enumerate(embedded_images)]
+                    self.conn.executemany(
+                        "INSERT INTO attachments (ticket_id, position, name, path, content) VALUES (?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    ids.append(ticket_id)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def load(self, ticket_id):
+        """Return the queued entry as a dict, or None if it is gone."""
+        with self.lock:
+            row = self.conn.execute("SELECT data, attempts, source FROM tickets WHERE id = ?", (ticket_id,)).fetchone()
+            if row is None:
+                return None
+            files = self.conn.execute(
+                "SELECT name, path, content FROM attachments WHERE ticket_id = ? ORDER BY position",
+                (ticket_id,)
+            ).fetchall()
+        return {
+            "id": ticket_id,
+            "data": json.loads(row[0]),
+            "attempts": row[1],
+            "source": row[2],
+            "files": [(name, path, bytes(content) if content is not None else None) for name, path, content in files]
+        }
+
+    def due(self, limit, exclude=()):
+        """Return ids of entries whose next attempt is due, oldest first."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id FROM tickets WHERE held = 0 AND next_attempt <= ? ORDER BY next_attempt, id LIMIT ?",
+                (time.time(), limit + len(exclude))
+            ).fetchall()
+        return [ticket_id for (ticket_id,) in rows if ticket_id not in exclude][:limit]
+
+    def next_attempt(self, exclude=()):
+        """Return the earliest scheduled attempt time among entries not in flight."""
+        with self.lock:
+            rows = self.conn.execute("SELECT id, next_attempt FROM tickets WHERE held = 0 ORDER BY next_attempt").fetchall()
+        for ticket_id, next_attempt in rows:
+            if ticket_id not in exclude:
+                return next_attempt
+        return None
+
+    def reschedule(self, ticket_id, error, network_error, retry_after=None):
+        """Record a failed attempt and schedule the next one; return the delay in seconds."""
+        with self.lock:
+            row = self.conn.execute("SELECT attempts FROM tickets WHERE id = ?", (ticket_id,)).fetchone()
+            attempts = (row[0] if row else 0) + 1
+            delay = retry_delay(attempts, retry_after)
+            self.conn.execute(
+                "UPDATE tickets SET attempts = ?, next_attempt = ?, network_error = ?, last_error = ? WHERE id = ?",
+                (attempts, time.time() + delay, int(network_error), error, ticket_id)
+            )
+        return delay
+
+    def wake_network_waiters(self):
+        """Make entries that only failed on connectivity due now, since the link is back."""
+        with self.lock:
+            self.conn.execute(
+                "UPDATE tickets SET next_attempt = ? WHERE network_error = 1 AND next_attempt > ?",
+                (time.time(), time.time())
+            )
+
+    def hold(self, ticket_id, error):
+        """Stop sending an entry but keep it, so a failed ticket can be restored into the form later."""
+        with self.lock:
+            self.conn.execute("UPDATE tickets SET held = 1, last_error = ? WHERE id = ?", (error, ticket_id))
+
+    def held(self):
+        """Return ids of held entries, oldest first."""
+        with self.lock:
+            rows = self.conn.execute("SELECT id FROM tickets WHERE held = 1 ORDER BY id").fetchall()
+        return [ticket_id for (ticket_id,) in rows]
+
+    def remove(self, ticket_id):
+        with self.lock:
+            self.conn.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,))
+
+    def count(self):
+        """Number of entries still to be sent."""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tickets WHERE held = 0").fetchone()[0]
+
+class SubmissionSignals(QObject):
+    """Signals a TicketSubmission emits back to the GUI thread."""
+    progress = pyqtSignal(int, str, int, int)         # outbox id, attachment name, bytes sent, bytes total
+    succeeded = pyqtSignal(int, object)               # outbox id, created ticket JSON
+    failed = pyqtSignal(int, str, bool, int, object)  # outbox id, error message, retryable, HTTP status (0 if none), Retry-After
+    cancelled = pyqtSignal(int)                       # outbox id
+
+class TicketSubmission(QRunnable):
+    """Background worker that reads attachments and posts one queued ticket off the GUI thread."""
+
+    def __init__(self, entry, client):
+        super().__init__()
+        self.submission_id = entry["id"]
+        self.client = client
+        self.data = entry["data"]
+        self.files = entry["files"]
+        self.signals = SubmissionSignals()
+        self.cancel_event = threading.Event()
+        self.trace = SubmissionTrace()
+        self.setAutoDelete(True)
+
+    def cancel(self):
+        """Ask the worker to stop at the next upload chunk."""
+        self.cancel_event.set()
+
+    def report_progress(self, file_name, sent, total):
+        self.signals.progress.emit(self.submission_id, file_name, sent, total)
+
+    def run(self):
+        try:
+            if self.cancel_event.is_set():
+                raise SubmissionCancelled("Upload cancelled by user")
+
+            self.trace = SubmissionTrace()
+            try:
+                with self.trace.span("attachments"):
+                    total_size = check_attachment_sizes(self.files)
+                self.trace.sizes["attachment_bytes"] = total_size
+                logger.info(f"Uploading {len(self.files)} attachment(s), {total_size} bytes")
+            except (OSError, AttachmentTooLarge) as attachment_error:
+                logger.error(f"Error processing attachments: {attachment_error}")
+                self.signals.failed.emit(self.submission_id, f"Could not process attachments or embedded images:\n{attachment_error}", False, 0, None)
+                return
+
+            response = self.client.create_ticket(self.data, self.files, self.report_progress,
+                                                 self.cancel_event.is_set, self.trace)
+            logger.info(f"Response status code: {response.status_code}")
+            logger.info(f"Response body: {response.text}")
+
+            if response.status_code == 201:
+                self.signals.succeeded.emit(self.submission_id, response.json())
+                return
+
+            try:
+                error_message = response.json().get("message", response.text)
+            except ValueError:
+                error_message = response.text
+            logger.error(f"API returned an error: {error_message}")
+            retryable = response.status_code == 429 or response.status_code >= 500
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.signals.failed.emit(self.submission_id, f"Failed to create ticket: {error_message}", retryable, response.status_code, retry_after)
+        except SubmissionCancelled:
+            logger.info(f"Submission {self.submission_id} cancelled.")
+            self.signals.cancelled.emit(self.submission_id)
+        except RateLimited as rate_limited:
+            logger.info(f"Ticket {self.submission_id} held back: {rate_limited}")
+            self.signals.failed.emit(self.submission_id, str(rate_limited), True, 429, rate_limited.delay)
+        except (requests.ConnectionError, requests.Timeout) as network_error:
+            logger.warning(f"Network error sending ticket {self.submission_id}: {network_error}")
+            self.signals.failed.emit(self.submission_id, f"Failed to communicate with Freshdesk: {network_error}", True, 0, None)
+        except Exception as request_error:
+            logger.error(f"Error making API request: {request_error}")
+            self.signals.failed.emit(self.submission_id, f"Failed to communicate with Freshdesk: {request_error}", False, 0, None)
+
+class TicketHistory:
+    """
+    SQLite cache of the tickets created from this machine and their latest status.
+
+    Rows are added from the 201 response of each submission and kept current by the
+    background updated_since sync, so the history panel never has to ask Freshdesk.
+    """
+
+    def __init__(self, path=HISTORY_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tickets (
+                id INTEGER PRIMARY KEY,
+                subject TEXT NOT NULL,
+                email TEXT,
+                status INTEGER,
+                priority INTEGER,
+                created_at TEXT,
+                updated_at TEXT
+            );
+        """)
+
+    def record(self, ticket):
+        """Store a ticket from Freshdesk's create response."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tickets (id, subject, email, status, priority, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ticket["id"], ticket.get("subject") or "", ticket.get("email"), ticket.get("status"),
+                 ticket.get("priority"), ticket.get("created_at"), ticket.get("updated_at"))
+            )
+
+    def apply_updates(self, tickets):
+        """Take status and priority from synced tickets for the ones we created; return how many changed."""
+        rows = [(ticket.get("status"), ticket.get("priority"), ticket.get("updated_at"), ticket["id"],
+                 ticket.get("updated_at") or "") for ticket in tickets]
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "UPDATE tickets SET status = COALESCE(?, status), priority = COALESCE(?, priority), updated_at = ? "
+                "WHERE id = ? AND IFNULL(updated_at, '') < ?", rows
+            )
+            return self.conn.total_changes - before
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+
+    def page(self, before_id=None, limit=HISTORY_PAGE_SIZE):
+        """The next newest tickets with an id below before_id, as (id, subject, status, priority, created_at, updated_at)."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, subject, status, priority, created_at, updated_at FROM tickets "
+                "WHERE id < ? ORDER BY id DESC LIMIT ?",
+                (before_id if before_id is not None else 2 ** 63 - 1, limit)
+            ).fetchall()
+
+class OutboxDrainer(QObject):
+    """
+    Sends queued tickets in the background and reschedules failures.
+
+    Network errors, 429s and 5xx responses stay in the outbox with exponential backoff
+    (honoring Retry-After); any other error rejects the ticket so the user can fix it.
+    """
+    progress = pyqtSignal(int, str, int, int)  # outbox id, attachment name, bytes sent, bytes total
+    created = pyqtSignal(int, object, object)  # outbox id, created ticket JSON, outbox entry
+    delayed = pyqtSignal(int, str, float, int, object)  # outbox id, error message, seconds until retry, HTTP status (0 if none), outbox entry
+    rejected = pyqtSignal(int, str, object)    # outbox id, error message, outbox entry
+    cancelled = pyqtSignal(int, object)        # outbox id, outbox entry
+    changed = pyqtSignal()                     # in-flight or queued tickets changed
+    attempted = pyqtSignal(int, object, str)   # outbox id, SubmissionTrace of the attempt, outcome
+
+    def __init__(self, outbox, client, thread_pool, parent=None):
+        super().__init__(parent)
+        self.outbox = outbox
+        self.client = client
+        self.thread_pool = thread_pool
+        self.in_flight = {}  # outbox id -> (TicketSubmission, entry)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.drain)
+
+    def drain(self):
+        """Start submissions for every due ticket, up to the batch size."""
+        free_slots = OUTBOX_BATCH_SIZE - len(self.in_flight)
+        if free_slots > 0:
+            for ticket_id in self.outbox.due(free_slots, exclude=self.in_flight):
+                entry = self.outbox.load(ticket_id)
+                if entry is None:
+                    continue
+                submission = TicketSubmission(entry, self.client)
+                submission.signals.progress.connect(self.progress)
+                submission.signals.succeeded.connect(self.on_succeeded)
+                submission.signals.failed.connect(self.on_failed)
+                submission.signals.cancelled.connect(self.on_cancelled)
+                self.in_flight[ticket_id] = (submission, entry)
+                self.thread_pool.start(submission)
+        self.schedule()
+        self.changed.emit()
+
+    def schedule(self):
+        """Arm the timer for the next queued ticket that is not already in flight."""
+        next_attempt = self.outbox.next_attempt(exclude=self.in_flight)
+        if next_attempt is None:
+            self.timer.stop()
+            return
+        delay = min(max(0.0, next_attempt - time.time()), OUTBOX_MAX_SLEEP)
+        self.timer.start(int(delay * 1000))
+
+    def cancel_all(self):
+        """Cancel every ticket that is currently uploading."""
+        for submission, _ in self.in_flight.values():
+            submission.cancel()
+
+    def pending_count(self):
+        return self.outbox.count()
+
+    def settle(self, ticket_id, entry, error_message):
+        """Take a ticket that will not be retried out of the queue; the GUI restores or removes form tickets."""
+        if entry is not None and entry.get("source") == "api":
+            self.outbox.remove(ticket_id)
+        else:
+            self.outbox.hold(ticket_id, error_message)
+
+    def on_succeeded(self, ticket_id, ticket):
+        submission, entry = self.in_flight.pop(ticket_id, (None, None))
+        self.outbox.remove(ticket_id)
+        if submission is not None:
+            self.attempted.emit(ticket_id, submission.trace, "created")
+        self.created.emit(ticket_id, ticket, entry)
+        # The link works again, so anything waiting on a network error can go right away
+        self.outbox.wake_network_waiters()
+        self.drain()
+
+    def on_failed(self, ticket_id, error_message, retryable, status_code, retry_after):
+        submission, entry = self.in_flight.pop(ticket_id, (None, None))
+        if submission is not None:
+            self.attempted.emit(ticket_id, submission.trace, "retry" if retryable else "rejected")
+        if retryable:
+            delay = self.outbox.reschedule(ticket_id, error_message, status_code == 0, retry_after)
+            logger.info(f"Ticket {ticket_id} queued for retry in {delay:.1f}s")
+            self.delayed.emit(ticket_id, error_message, delay, status_code, entry)
+        else:
+            self.settle(ticket_id, entry, error_message)
+            self.rejected.emit(ticket_id, error_message, entry)
+        self.schedule()
+        self.changed.emit()
+
+    def on_cancelled(self, ticket_id):
+        submission, entry = self.in_flight.pop(ticket_id, (None, None))
+        self.settle(ticket_id, entry, "Cancelled")
+        if submission is not None:
+            self.attempted.emit(ticket_id, submission.trace, "cancelled")
+        self.cancelled.emit(ticket_id, entry)
+        self.schedule()
+        self.changed.emit()
+
+class SubmissionTrace:
+    """Timing spans (seconds) and payload sizes for one ticket or one send attempt."""
+
+    def __init__(self):
+        self.created = time.time()
+        self.origin = time.perf_counter()
+        self.queued_at = None
+        self.spans = {}
+        self.sizes = {}
+        self.status = None
+        self.attempts = 0
+
+    def add(self, phase, seconds):
+        self.spans[phase] = self.spans.get(phase, 0.0) + seconds
+
+    @contextlib.contextmanager
+    def span(self, phase):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - started)
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+class SubmissionMetrics:
+    """
+    Joins the GUI-side trace of each ticket with its final send attempt.
+
+    Every finished ticket is appended as one JSON line to metrics.jsonl; the most recent
+    ones back the in-app stats view and the optional loopback Prometheus endpoint.
+    """
+
+    def __init__(self, path=METRICS_FILE, history=METRICS_HISTORY):
+        self.path = path
+        self.lock = threading.Lock()
+        self.pending = {}  # outbox id -> SubmissionTrace from the submit click
+        self.recent = collections.deque(maxlen=history)
+        self.history_loaded = False
+        self.outcomes = collections.Counter()
+        self.phase_totals = collections.defaultdict(lambda: [0, 0.0])  # phase -> [count, seconds]
+
+    def queued(self, ticket_id, trace):
+        trace.queued_at = time.perf_counter()
+        self.pending[ticket_id] = trace
+
+    def attempt_finished(self, ticket_id, attempt, outcome):
+        """Fold one TicketSubmission's trace in; retries only count until the ticket settles."""
+        trace = self.pending.get(ticket_id)
+        if trace is None:
+            trace = self.pending[ticket_id] = SubmissionTrace()  # queued by an earlier run
+        trace.attempts += 1
+        if outcome == "retry":
+            trace.add("failed_attempts", time.perf_counter() - attempt.origin)
+            return
+        del self.pending[ticket_id]
+        if trace.queued_at is not None:
+            trace.add("queue_wait", attempt.origin - trace.queued_at)
+        for phase, seconds in attempt.spans.items():
+            trace.add(phase, seconds)
+        trace.sizes.update(attempt.sizes)
+        trace.status = attempt.status
+        trace.add("total", time.perf_counter() - trace.origin)
+        self.record(ticket_id, trace, outcome)
+
+    def record(self, ticket_id, trace, outcome):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(trace.created)),
+            "ticket_id": ticket_id,
+            "outcome": outcome,
+            "status": trace.status,
+            "attempts": trace.attempts,
+            "spans_ms": {phase: round(seconds * 1000, 1) for phase, seconds in trace.spans.items()},
+            "sizes": trace.sizes,
+        }
+        with self.lock:
+            self.load_history()
+            self.recent.append(entry)
+            self.outcomes[outcome] += 1
+            for phase, seconds in trace.spans.items():
+                totals = self.phase_totals[phase]
+                totals[0] += 1
+                totals[1] += seconds
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > METRICS_MAX_BYTES:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write submission metrics: {e}")
+
+    def load_history(self):
+        """Seed the recent list from the end of metrics.jsonl the first time it is needed."""
+        if self.history_loaded:
+            return
+        self.history_loaded = True
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(max(0, os.path.getsize(self.path) - 64 * 1024))
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            return
+        for line in lines[-self.recent.maxlen:]:
+            try:
+                self.recent.append(json.loads(line))
+            except ValueError:
+                continue
+
+    def summary(self):
+        """(number of records, outcome counts, [(phase, count, p50 ms, p95 ms)]) over the recent submissions."""
+        with self.lock:
+            self.load_history()
+            recent = list(self.recent)
+        by_phase = collections.defaultdict(list)
+        for entry in recent:
+            for phase, ms in entry["spans_ms"].items():
+                by_phase[phase].append(ms)
+        order = {phase: index for index, phase in enumerate(SUBMISSION_PHASES)}
+        phases = [(phase, len(values), percentile(values, 0.5), percentile(values, 0.95))
+                  for phase, values in sorted(by_phase.items(), key=lambda item: order.get(item[0], len(order)))]
+        outcomes = collections.Counter(entry["outcome"] for entry in recent)
+        return len(recent), outcomes, phases
+
+    def prometheus_text(self):
+        """Prometheus text exposition: counters since launch plus quantiles over the recent submissions."""
+        _, _, phases = self.summary()
+        lines = ["# TYPE ticketmaker_submissions_total counter"]
+        with self.lock:
+            outcomes = dict(self.outcomes)
+            totals = {phase: list(values) for phase, values in self.phase_totals.items()}
+        for outcome, count in sorted(outcomes.items()):
+            lines.append(f'ticketmaker_submissions_total{{outcome="{outcome}"}} {count}')
+        lines.append("# TYPE ticketmaker_submission_phase_seconds summary")
+        for phase, _, p50, p95 in phases:
+            lines.append(f'ticketmaker_submission_phase_seconds{{phase="{phase}",quantile="0.5"}} {p50 / 1000:.6f}')
+            lines.append(f'ticketmaker_submission_phase_seconds{{phase="{phase}",quantile="0.95"}} {p95 / 1000:.6f}')
+        for phase, (count, seconds) in sorted(totals.items()):
+            lines.append(f'ticketmaker_submission_phase_seconds_sum{{phase="{phase}"}} {seconds:.6f}')
+            lines.append(f'ticketmaker_submission_phase_seconds_count{{phase="{phase}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics endpoint: {format % args}")
+
+def start_metrics_server(metrics, port=METRICS_PORT):
+    """Serve /metrics on 127.0.0.1 from a daemon thread; disabled unless a port is configured."""
+    if not port:
+        return None
+    try:
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", port), MetricsRequestHandler)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint unavailable on 127.0.0.1:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    server.metrics = metrics
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    logger.info(f"Serving submission metrics on http://127.0.0.1:{port}/metrics")
+    return server
+
+class MetadataCache:
+    """
+    On-disk copy of slow-changing Freshdesk metadata such as ticket fields and contacts.
+
+    Each entry is one JSON file with the data, the time it was fetched and the response
+    validators (ETag, Last-Modified), so a stale entry is revalidated with a conditional
+    request and an unchanged one costs a single 304.
+    """
+
+    def __init__(self, path=METADATA_PATH):
+        self.path = path
+
+    def load(self, name):
+        try:
+            with open(os.path.join(self.path, f"{name}.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable {name} cache: {e}")
+            return None
+
+    def store(self, name, entry):
+        os.makedirs(self.path, exist_ok=True)
+        file_path = os.path.join(self.path, f"{name}.json")
+        with open(f"{file_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(f"{file_path}.tmp", file_path)
+
+    @staticmethod
+    def is_fresh(entry, ttl):
+        return entry is not None and time.time() - entry.get("fetched_at", 0) < ttl
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers from a cached entry's validators."""
+    headers = {}
+    if entry and entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry and entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+def refresh_ticket_fields(client, cache):
+    """Ticket field definitions, from the cache while fresh and revalidated once stale."""
+    entry = cache.load("ticket_fields")
+    if MetadataCache.is_fresh(entry, TICKET_FIELDS_TTL):
+        return entry["data"]
+    response = client.request("GET", "ticket_fields", headers=conditional_headers(entry))
+    if response.status_code == 304 and entry:
+        entry["fetched_at"] = time.time()
+    else:
+        response.raise_for_status()
+        entry = {
+            "fetched_at": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "data": response.json(),
+        }
+    cache.store("ticket_fields", entry)
+    return entry["data"]
+
+def refresh_contacts(client, cache):
+    """
+    Contacts as compact {id, name, email} dicts, kept current with incremental syncs.
+
+    The first sync pages through every contact; later ones only ask for contacts updated
+    since the previous sync and merge them in by id. The contacts list has no useful
+    order, so a sync that stops at CONTACTS_MAX_PAGES keeps its cursor and the next sync
+    carries on from the following page before the cursor moves.
+    """
+    entry = cache.load("contacts")
+    resume = entry.get("resume") if entry else None
+    if MetadataCache.is_fresh(entry, CONTACTS_TTL) and not resume:
+        return entry["data"]
+    params = {"per_page": CONTACTS_PAGE_SIZE}
+    if resume:
+        synced_at, first = resume["started"], resume["page"]
+        if resume["since"]:
+            params["_updated_since"] = resume["since"]
+    else:
+        synced_at, first = time.time(), 1
+        if entry:
+            since = time.gmtime(entry.get("synced_at", 0) - CONTACTS_SYNC_OVERLAP)
+            params["_updated_since"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", since)
+
+    contacts = {contact["id"]: contact for contact in entry["data"]} if entry else {}
+    headers = conditional_headers(entry) if first == 1 else {}
+    first_page = None
+    resume = None
+    for page in range(first, first + CONTACTS_MAX_PAGES):
+        response = client.request("GET", "contacts", params=dict(params, page=page), headers=headers)
+        if page == 1 and response.status_code == 304 and entry:
+            entry["fetched_at"] = entry["synced_at"] = synced_at
+            cache.store("contacts", entry)
+            return entry["data"]
+        response.raise_for_status()
+        if page == 1:
+            first_page = response
+            headers = {}
+        batch = response.json()
+        for contact in batch:
+            contacts[contact["id"]] = {"id": contact["id"], "name": contact.get("name") or "",
+                                       "email": contact.get("email") or ""}
+        if len(batch) < CONTACTS_PAGE_SIZE or 'rel="next"' not in response.headers.get("Link", ""):
+            break
+    else:
+        resume = {"page": page + 1, "since": params.get("_updated_since"), "started": synced_at}
+        logger.info(f"Contact sync stopped at page {page}; continuing from there next time")
+
+    finished = resume is None and first == 1
+    entry = {
+        "fetched_at": time.time(),
+        # Until a pass completes, the previous cursor still marks what is fully synced
+        "synced_at": synced_at if resume is None else (entry or {}).get("synced_at", 0),
+        "etag": first_page.headers.get("ETag") if finished and first_page is not None else None,
+        "last_modified": first_page.headers.get("Last-Modified") if finished and first_page is not None else None,
+        "resume": resume,
+        "data": list(contacts.values()),
+    }
+    cache.store("contacts", entry)
+    return entry["data"]
+
+def field_choices(fields, name):
+    """
+    [(label, value)] for a ticket field's dropdown, or None if Freshdesk did not send one.
+
+    Priority and group choices come as {"Low": 1}, status choices as {"2": ["Open", "Being
+    Processed"]} and type choices as a plain list of names, which are also the values.
+    """
+    for field in fields or []:
+        if field.get("name") != name or not field.get("choices"):
+            continue
+        if isinstance(field["choices"], list):
+            return [(choice, choice) for choice in field["choices"]]
+        choices = []
+        for key, value in field["choices"].items():
+            if isinstance(value, list):
+                choices.append((value[0], int(key)))
+            else:
+                choices.append((key, int(value)))
+        return choices
+    return None
+
+class ContactIndex:
+    """
+    Sorted prefix index over contact emails and names for email autocomplete.
+
+    Every lowercased email, full name and later name part is a key, so a lookup is one
+    bisect plus a short scan, no matter how many contacts there are.
+    """
+
+    def __init__(self, contacts=()):
+        entries = set()
+        for contact in contacts:
+            email = (contact.get("email") or "").strip()
+            if not email:
+                continue
+            entries.add((email.lower(), email))
+            name = " ".join((contact.get("name") or "").lower().split())
+            if name:
+                entries.add((name, email))
+                for part in name.split()[1:]:
+                    entries.add((part, email))
+        self.entries = sorted(entries)
+        self.keys = [key for key, _ in self.entries]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def complete(self, prefix, limit=EMAIL_COMPLETIONS):
+        """Up to limit distinct emails whose address or name starts with prefix."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+        matches = []
+        index = bisect.bisect_left(self.keys, prefix)
+        while index < len(self.keys) and self.keys[index].startswith(prefix) and len(matches) < limit:
+            email = self.entries[index][1]
+            if email not in matches:
+                matches.append(email)
+            index += 1
+        return matches
+
+class MetadataSignals(QObject):
+    """Signals a MetadataRefresh emits back to the GUI thread."""
+    ticket_fields = pyqtSignal(object)  # list of ticket field definitions
+    contacts = pyqtSignal(object)       # ContactIndex
+
+class MetadataRefresh(QRunnable):
+    """Background worker that serves cached metadata at once, then refreshes whatever is stale."""
+
+    def __init__(self, client, cache):
+        super().__init__()
+        self.client = client
+        self.cache = cache
+        self.signals = MetadataSignals()
+
+    def run(self):
+        for name, refresh, ttl in (("ticket_fields", refresh_ticket_fields, TICKET_FIELDS_TTL),
+                                   ("contacts", refresh_contacts, CONTACTS_TTL)):
+            cached = self.cache.load(name)
+            if cached:
+                self.publish(name, cached["data"])
+            if MetadataCache.is_fresh(cached, ttl):
+                continue
+            try:
+                self.publish(name, refresh(self.client, self.cache))
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Could not refresh Freshdesk {name}: {e}")
+
+    def publish(self, name, data):
+        if name == "contacts":
+            started = time.perf_counter()
+            index = ContactIndex(data)
+            logger.info(f"Indexed {len(data)} contacts in {(time.perf_counter() - started) * 1000:.0f} ms")
+            self.signals.contacts.emit(index)
+        else:
+            self.signals.ticket_fields.emit(data)
+
+def tokenize(text):
+    """Lowercased word tokens worth matching on, without HTML tags and stop words."""
+    words = WORD_RE.findall(HTML_TAG_RE.sub(" ", text or "").lower())
+    return [word for word in words if word not in STOP_WORDS]
+
+class TicketIndex:
+    """
+    Token inverted index over recent open tickets for duplicate detection.
+
+    Subject tokens count fully and the first few description tokens, where a ticket has
+    one, at half weight; a query's score is the IDF-weighted share of its tokens found in a ticket. The caller
+    bounds the corpus (DUPLICATE_INDEX_MAX_TICKETS), so memory stays flat as the helpdesk
+    grows.
+    """
+
+    def __init__(self, tickets=()):
+        self.tickets = {}   # id -> (subject, status)
+        self.postings = {}  # token -> {id: weight}
+        for ticket in tickets:
+            self.add(ticket)
+
+    def add(self, ticket):
+        ticket_id = ticket["id"]
+        self.tickets[ticket_id] = (ticket["subject"], ticket["status"])
+        weights = dict.fromkeys(tokenize(ticket.get("description") or "")[:DUPLICATE_DESCRIPTION_TOKENS], 0.5)
+        weights.update(dict.fromkeys(tokenize(ticket["subject"]), 1.0))
+        for token, weight in weights.items():
+            self.postings.setdefault(token, {})[ticket_id] = weight
+
+    def __len__(self):
+        return len(self.tickets)
+
+    def search(self, text, limit=DUPLICATE_MAX_RESULTS, min_score=DUPLICATE_MIN_SCORE):
+        """[(score, id, subject, status)] for the tickets most similar to text."""
+        tokens = set(tokenize(text))
+        if len(tokens) < 2 or not self.tickets:
+            return []
+        scores = collections.defaultdict(float)
+        total = 0.0
+        corpus = len(self.tickets)
+        for token in tokens:
+            postings = self.postings.get(token, {})
+            weight = math.log((corpus + 1) / (len(postings) + 1)) + 1
+            total += weight
+            for ticket_id, field_weight in postings.items():
+                scores[ticket_id] += weight * field_weight
+        ranked = sorted(((score / total, ticket_id) for ticket_id, score in scores.items()), reverse=True)
+        return [(score, ticket_id) + self.tickets[ticket_id] for score, ticket_id in ranked[:limit] if score >= min_score]
+
+def refresh_recent_tickets(client, cache, history=None):
+    """
+    Open tickets updated in the last DUPLICATE_INDEX_DAYS, synced incrementally.
+
+    Each sync only asks for tickets updated since the previous one; resolved and closed
+    tickets drop out, and the oldest are trimmed to DUPLICATE_INDEX_MAX_TICKETS. Pages are
+    fetched without include=description, which costs extra API credits per page, so only
+    descriptions already in the cache are kept. The same pages update the status of our own tickets in history. Returns (tickets, history changes).
+    """
+    entry = cache.load("recent_tickets")
+    now = time.time()
+    if entry:
+        since = entry["synced_at"] - CONTACTS_SYNC_OVERLAP
+    else:
+        since = now - DUPLICATE_INDEX_DAYS * 24 * 60 * 60
+    tickets = {ticket["id"]: ticket for ticket in entry["data"]} if entry else {}
+    params = {
+        "updated_since": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(since)),
+        "order_by": "updated_at",
+        "order_type": "asc",
+        "per_page": TICKETS_PAGE_SIZE,
+    }
+    changed = 0
+    synced_at = now
+    for page in range(1, TICKETS_MAX_PAGES + 1):
+        response = client.request("GET", "tickets", params=dict(params, page=page))
+        response.raise_for_status()
+        batch = response.json()
+        if history is not None:
+            changed += history.apply_updates(batch)
+        for ticket in batch:
+            if ticket.get("status") in CLOSED_STATUSES:
+                tickets.pop(ticket["id"], None)
+                continue
+            tickets[ticket["id"]] = {
+                "id": ticket["id"],
+                "subject": ticket.get("subject") or "",
+                "description": tickets.get(ticket["id"], {}).get("description", ""),
+                "status": ticket.get("status"),
+                "updated_at": ticket.get("updated_at") or "",
+            }
+        if len(batch) < TICKETS_PAGE_SIZE:
+            break
+    else:
+        # Pages run oldest update first, so the newest tickets were not reached yet. Resume at
+        # the last update seen (a server time, so the overlap is added back), always moving
+        # forward so a crowded second cannot stall the sync.
+        last_updated = calendar.timegm(time.strptime(batch[-1]["updated_at"], "%Y-%m-%dT%H:%M:%SZ"))
+        synced_at = min(now, max(last_updated, since + 1) + CONTACTS_SYNC_OVERLAP)
+        logger.info(f"Ticket sync stopped at page {page}; resuming from {batch[-1]['updated_at']}")
+
+    cutoff = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - DUPLICATE_INDEX_DAYS * 24 * 60 * 60))
+    recent = sorted((ticket for ticket in tickets.values() if ticket["updated_at"] >= cutoff),
+                    key=lambda ticket: ticket["updated_at"])[-DUPLICATE_INDEX_MAX_TICKETS:]
+    cache.store("recent_tickets", {"fetched_at": now, "synced_at": synced_at, "data": recent})
+    return recent, changed
+
+class TicketIndexSignals(QObject):
+    """Signals a TicketIndexRefresh emits back to the GUI thread."""
+    indexed = pyqtSignal(object)       # TicketIndex
+    history_changed = pyqtSignal(int)  # number of our tickets whose status changed
+
+class TicketIndexRefresh(QRunnable):
+    """Background worker that rebuilds the duplicate index from the cache, then from a sync."""
+
+    def __init__(self, client, cache, publish_cached=False, history=None):
+        super().__init__()
+        self.client = client
+        self.cache = cache
+        self.publish_cached = publish_cached
+        self.history = history
+        self.signals = TicketIndexSignals()
+
+    def run(self):
+        if self.publish_cached:
+            cached = self.cache.load("recent_tickets")
+            if cached:
+                self.publish(cached["data"])
+        try:
+            tickets, changed = refresh_recent_tickets(self.client, self.cache, self.history)
+            if changed:
+                self.signals.history_changed.emit(changed)
+            self.publish(tickets)
+        except (requests.RequestException, ValueError, KeyError) as e:
+            logger.warning(f"Could not sync recent tickets for duplicate detection: {e}")
+
+    def publish(self, tickets):
+        started = time.perf_counter()
+        index = TicketIndex(tickets)
+        logger.info(f"Indexed {len(index)} open tickets in {(time.perf_counter() - started) * 1000:.0f} ms")
+        self.signals.indexed.emit(index)
+
+def read_import_rows(path):
+    """Yield ticket rows (dicts) from a CSV or JSONL file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                yield {key.strip().lower(): value for key, value in row.items() if key}
+    else:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def import_row_key(row):
+    """Stable checkpoint key: the row's own id if it has one, otherwise a hash of its content."""
+    for field in ("id", "external_id"):
+        if row.get(field):
+            return str(row[field])
+    return hashlib.sha256(json.dumps(row, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def build_import_ticket(row, defaults):
+    """Turn an import row into (ticket data, attachment paths, embedded images)."""
+    subject = (row.get("subject") or "").strip()
+    email = (row.get("email") or defaults["email"] or "").strip()
+    if not subject or not email:
+        raise ValueError("Subject and Email are required!")
+    priority = parse_choice(row.get("priority") or defaults["priority"], PRIORITIES, "priority")
+    status = parse_choice(row.get("status") or defaults["status"], STATUSES, "status")
+    description, images = extract_embedded_images(row.get("description") or "")
+    description = compact_html(description)
+
+    attachments = row.get("attachments") or []
+    if isinstance(attachments, str):
+        attachments = [path.strip() for path in attachments.split(";") if path.strip()]
+    return build_ticket_data(subject, email, description, priority, status), attachments, images
+
+def import_one_ticket(client, row, defaults):
+    """Create one imported ticket, retrying rate limits and transient failures. Returns the ticket id."""
+    data, attachments, images = build_import_ticket(row, defaults)
+    images, _ = prepare_embedded_images(data, attachments, images)
+    files = [(os.path.basename(path), path, None) for path in attachments] + \
+            [(name, None, content) for name, content in images]
+
+    for attempt in range(1, BULK_IMPORT_MAX_ATTEMPTS + 1):
+        try:
+            response = client.create_ticket(data, files)
+        except (requests.ConnectionError, requests.Timeout) as network_error:
+            if attempt == BULK_IMPORT_MAX_ATTEMPTS:
+                raise
+            logger.warning(f"Network error, retrying: {network_error}")
+            time.sleep(retry_delay(attempt))
+            continue
+
+        if response.status_code == 201:
+            return response.json().get("id")
+        if response.status_code == 429 and attempt < BULK_IMPORT_MAX_ATTEMPTS:
+            continue  # the governor holds every worker until Retry-After has passed
+        if response.status_code >= 500 and attempt < BULK_IMPORT_MAX_ATTEMPTS:
+            time.sleep(retry_delay(attempt, parse_retry_after(response.headers.get("Retry-After"))))
+            continue
+        try:
+            error_message = response.json().get("message", response.text)
+        except ValueError:
+            error_message = response.text
+        raise RuntimeError(f"HTTP {response.status_code}: {error_message}")
+
+def load_checkpoint(path):
+    """Return the row keys already created by an earlier run."""
+    done = set()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["key"])
+                except (ValueError, KeyError):
+                    continue  # a torn last line from an interrupted run
+    return done
+
+def print_progress(done, total, created, failed, started):
+    width = 30
+    filled = int(width * done / total) if total else width
+    rate = created / max(time.time() - started, 1e-6)
+    sys.stderr.write(f"\r[{'#' * filled}{'.' * (width - filled)}] {done}/{total} "
+                     f"created={created} failed={failed} {rate:.1f}/s")
+    sys.stderr.flush()
+
+def run_bulk_import(args, config):
+    """
+    Create tickets from a CSV or JSONL file without starting the GUI.
+
+    Completed rows are appended to a checkpoint file as they finish, so an interrupted run
+    can be started again with the same arguments and skips what was already created.
+    """
+    checkpoint_path = args.checkpoint or f"{args.file}.checkpoint.jsonl"
+    done = load_checkpoint(checkpoint_path)
+    rows = [(import_row_key(row), row) for row in read_import_rows(args.file)]
+    pending = [(key, row) for key, row in rows if key not in done]
+    defaults = {"email": args.email, "priority": args.priority, "status": args.status}
+    logger.info(f"Bulk import of {args.file}: {len(rows)} rows, {len(rows) - len(pending)} already done")
+
+    # Keep the console for the progress bar
+    for handler in log_listener.handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.WARNING)
+
+    # Workers wait for the shared rate-limit governor rather than give up on a row
+    client = FreshdeskClient(config["api_url"], config["api_key"], pool_size=args.workers, rate_limit_wait=None)
+    try:
+        created = failed = 0
+        started = time.time()
+        total = len(pending)
+        print_progress(0, total, created, failed, started)
+
+        with open(checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = {executor.submit(import_one_ticket, client, row, defaults): key for key, row in pending}
+
+            recorded = set()
+
+            def record(future):
+                nonlocal created, failed
+                recorded.add(future)
+                key = futures[future]
+                try:
+                    ticket_id = future.result()
+                    checkpoint.write(json.dumps({"key": key, "ticket_id": ticket_id}) + "\n")
+                    checkpoint.flush()
+                    os.fsync(checkpoint.fileno())
+                    created += 1
+                except Exception as e:
+                    logger.error(f"Import row {key} failed: {e}")
+                    failed += 1
+                print_progress(created + failed, total, created, failed, started)
+
+            try:
+                for future in as_completed(futures):
+                    record(future)
+            except KeyboardInterrupt:
+                # Stop queued rows, but checkpoint the ones already in flight so a rerun
+                # does not create them twice
+                sys.stderr.write("\nInterrupted; finishing requests in flight...\n")
+                running = [future for future in futures if future not in recorded and not future.cancel()]
+                for future in running:
+                    record(future)
+                sys.stderr.write("\nRun the same command again to resume.\n")
+                return 130
+
+        sys.stderr.write("\n")
+        print(f"Created {created} ticket(s), {failed} failed, {len(rows) - total} skipped from checkpoint {checkpoint_path}")
+        return 0 if not failed else 2
+    finally:
+        client.close()
+        if image_pool is not None:
+            image_pool.shutdown()
+
+def load_ingest_token():
+    """TICKETMAKER_INGEST_TOKEN, or this user's generated token (created on first use)."""
+    if INGEST_TOKEN:
+        return INGEST_TOKEN
+    try:
+        with open(INGEST_TOKEN_FILE, encoding="utf-8") as f:
+            token = f.read().strip()
+        if token:
+            return token
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(INGEST_TOKEN_FILE), exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    with os.fdopen(os.open(INGEST_TOKEN_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+        f.write(token)
+    logger.info(f"Generated an ingestion API token in {INGEST_TOKEN_FILE}")
+    return token
+
+def build_api_ticket(row):
+    """
+    Validate one ingestion API ticket the way the form does.
+
+    Files travel inline as files: [{"name", "content" (base64)}]; local attachment paths
+    are refused, since the endpoint must not upload files the caller could not read.
+    Returns (ticket data, attachment paths, (name, bytes) files) ready for the outbox.
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Each ticket must be a JSON object")
+    row = dict(row)
+    if row.pop("attachments", None):
+        raise ValueError('Attachment paths are not accepted; send the content as base64 "files"')
+    uploads = row.pop("files", None) or []
+    data, attachments, images = build_import_ticket(row, INGEST_DEFAULTS)
+    files = []
+    for upload in uploads:
+        if not isinstance(upload, dict) or not upload.get("name") or not isinstance(upload.get("content"), str):
+            raise ValueError('Each file needs a "name" and base64 "content"')
+        files.append((os.path.basename(upload["name"]), base64.b64decode(upload["content"], validate=True)))
+    if images:
+        images, _ = prepare_embedded_images(data, attachments, images, files)
+    else:
+        check_payload_budget(data, [(None, path, None) for path in attachments] +
+                             [(name, None, content) for name, content in files])
+    return data, attachments, list(images) + files
+
+class IngestServer(QObject):
+    """
+    Loopback HTTP/JSON endpoint that lets local scripts queue tickets (TICKETMAKER_INGEST_PORT).
+
+        POST /tickets       one ticket object or a list of them -> 202 {"ids": [outbox ids]}
+        GET  /tickets/<id>  {"status": "queued" | "created" | "rejected" | "cancelled", ...}
+
+    An asyncio loop on its own thread parses and validates requests. Validated tickets
+    wait for the writer, which puts everything that piled up meanwhile into the outbox in
+    one transaction, so a burst costs a handful of commits and the GUI thread hears about
+    each batch once. From the outbox on, tickets share the form's credentials, connection
+    pool and retries.
+
+    Every request needs "Authorization: Bearer <token>" (see load_ingest_token). Requests
+    carrying an Origin header come from a browser and are refused, and POST bodies must
+    be application/json, so a web page cannot queue tickets even as a simple request.
+    """
+    queued = pyqtSignal(object)  # [(outbox id, SubmissionTrace)]
+
+    def __init__(self, outbox, port, token, parent=None):
+        super().__init__(parent)
+        self.outbox = outbox
+        self.port = port
+        self.token = token
+        self.loop = None
+        self.stopping = None
+        self.pending = None
+        self.started = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest")
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+        self.lock = threading.Lock()
+        self.results = collections.OrderedDict()
+
+    def start(self):
+        threading.Thread(target=asyncio.run, args=(self.serve(),), name="ingest-endpoint", daemon=True).start()
+        self.started.wait(5)
+
+    def stop(self):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.stopping.set)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        # Batches already handed to the writer are accepted tickets, so they still get written
+        self.writer.shutdown(wait=False)
+
+    def settle(self, ticket_id, result):
+        """Remember how an API ticket ended, for GET /tickets/<id>."""
+        with self.lock:
+            self.results[ticket_id] = result
+            while len(self.results) > INGEST_RESULTS_KEPT:
+                self.results.popitem(last=False)
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        self.stopping = asyncio.Event()
+        self.pending = asyncio.Queue()
+        try:
+            server = await asyncio.start_server(self.handle_connection, "127.0.0.1", self.port)
+        except OSError as e:
+            logger.warning(f"Ingestion endpoint unavailable on 127.0.0.1:{self.port}: {e}")
+            self.started.set()
+            return
+        logger.info(f"Accepting tickets on http://127.0.0.1:{self.port}/tickets")
+        self.started.set()
+        writer = asyncio.create_task(self.write_batches())
+        async with server:
+            await self.stopping.wait()
+        writer.cancel()
+
+    async def write_batches(self):
+        while True:
+            batch = [await self.pending.get()]
+            while not self.pending.empty() and len(batch) < INGEST_BATCH_SIZE:
+                batch.append(self.pending.get_nowait())
+            started = time.perf_counter()
+            try:
+                ids = await self.loop.run_in_executor(
+                    self.writer, self.outbox.enqueue_many, [ticket for ticket, _, _ in batch], "api")
+            except Exception as e:
+                logger.error(f"Could not queue {len(batch)} API ticket(s): {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - started
+            for ticket_id, (_, trace, future) in zip(ids, batch):
+                trace.add("enqueue", elapsed)
+                future.set_result(ticket_id)
+            self.queued.emit(list(zip(ids, [trace for _, trace, _ in batch])))
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.respond(writer, 431, {"error": "Request headers too large"}, False)
+                    break
+                try:
+                    request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                    method, path, version = request_line.split(" ", 2)
+                    headers = {name.strip().lower(): value.strip()
+                               for name, _, value in (line.partition(":") for line in header_lines)}
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "Malformed request"}, False)
+                    break
+                if length > INGEST_MAX_BODY:
+                    await self.respond(writer, 413, {"error": f"Body over {INGEST_MAX_BODY // (1024 * 1024)} MB"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version.strip() == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, payload = await self.dispatch(method, path, headers, body)
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode("utf-8")
+        reason = http.server.BaseHTTPRequestHandler.responses.get(status, ("",))[0]
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                     .encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, path, headers, body):
+        if "origin" in headers:
+            return 403, {"error": "Browser requests are not accepted"}
+        if not hmac.compare_digest(headers.get("authorization", "").encode("latin-1"),
+                                   f"Bearer {self.token}".encode("utf-8")):
+            return 401, {"error": "Missing or wrong bearer token"}
+        path = path.split("?")[0].rstrip("/")
+        if path == "/tickets" and method == "POST":
+            if headers.get("content-type", "").split(";")[0].strip().lower() != "application/json":
+                return 415, {"error": "Content-Type must be application/json"}
+            return await self.post_tickets(body)
+        if path.startswith("/tickets/") and method == "GET" and path[9:].isdigit():
+            return await self.get_ticket(int(path[9:]))
+        return 404, {"error": f"No route for {method} {path}"}
+
+    async def post_tickets(self, body):
+        try:
+            rows = json.loads(body)
+        except ValueError as e:
+            return 400, {"error": f"Body is not JSON: {e}"}
+        rows = rows if isinstance(rows, list) else [rows]
+        if not rows:
+            return 400, {"error": "No tickets in request"}
+        tickets = []
+        for index, row in enumerate(rows):
+            trace = SubmissionTrace()
+            try:
+                with trace.span("validate"):
+                    ticket = await self.loop.run_in_executor(self.executor, build_api_ticket, row)
+            except (ValueError, OSError) as e:
+                return 400, {"error": str(e), "index": index}
+            tickets.append((ticket, trace))
+        futures = []
+        for ticket, trace in tickets:
+            future = self.loop.create_future()
+            self.pending.put_nowait((ticket, trace, future))
+            futures.append(future)
+        try:
+            ids = await asyncio.gather(*futures)
+        except Exception as e:
+            return 503, {"error": f"Could not queue tickets: {e}"}
+        return 202, {"ids": ids, "status": "queued"}
+
+    async def get_ticket(self, ticket_id):
+        with self.lock:
+            result = self.results.get(ticket_id)
+        if result is not None:
+            return 200, dict(id=ticket_id, **result)
+        entry = await self.loop.run_in_executor(self.writer, self.outbox.load, ticket_id)
+        if entry is None or entry.get("source") != "api":
+            return 404, {"error": f"Unknown ticket {ticket_id}"}
+        return 200, {"id": ticket_id, "status": "queued", "attempts": entry["attempts"]}
+
+def handoff_message(args):
+    """The show/prefill request a launch passes to the running instance."""
+    return {
+        "action": "show",
+        "subject": args.subject,
+        "email": args.email,
+        "attachments": [os.path.abspath(path) for path in args.attach]
+    }
+
+def send_to_running_instance(message):
+    """Hand a message to an already running TicketMaker; False if there is none."""
+    socket = QLocalSocket()
+    socket.connectToServer(INSTANCE_SERVER_NAME)
+    if not socket.waitForConnected(INSTANCE_CONNECT_TIMEOUT_MS):
+        return False
+    socket.write(json.dumps(message).encode("utf-8") + b"\n")
+    socket.waitForBytesWritten(INSTANCE_CONNECT_TIMEOUT_MS)
+    socket.disconnectFromServer()
+    return True
+
+class InstanceServer(QObject):
+    """Local socket that later launches use to hand their request to this instance."""
+    message_received = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        if not self.server.listen(INSTANCE_SERVER_NAME):
+            # A stale socket left behind by a crashed instance
+            QLocalServer.removeServer(INSTANCE_SERVER_NAME)
+            if not self.server.listen(INSTANCE_SERVER_NAME):
+                logger.warning(f"Single-instance server unavailable: {self.server.errorString()}")
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            socket.buffer = b""
+            socket.readyRead.connect(lambda socket=socket: self.on_ready_read(socket))
+            socket.disconnected.connect(socket.deleteLater)
+
+    def on_ready_read(self, socket):
+        socket.buffer += bytes(socket.readAll())
+        while b"\n" in socket.buffer:
+            line, socket.buffer = socket.buffer.split(b"\n", 1)
+            try:
+                self.message_received.emit(json.loads(line))
+            except ValueError as e:
+                logger.warning(f"Ignoring malformed instance message: {e}")
+
+def stage_image(data_uri, blobs):
+    """Decode one pasted data URI and stage it with stage_content(), or None if it is not an image."""
+    decoded = decode_data_uri(data_uri)
+    if decoded is None:
+        return None
+    return stage_content(*decoded, blobs)
+
+def stage_content(subtype, content, blobs):
+    """Hash one pasted image into (mime subtype, bytes, sha256); identical images share one buffer."""
+    digest = hashlib.sha256(content).hexdigest()
+    return subtype, blobs.setdefault(digest, content), digest
+
+class EditorBridge(QObject):
+    """
+    QWebChannel object that editor.html hands each pasted image to as soon as it appears.
+
+    Decoding and hashing run on a background thread while the user keeps typing, so at
+    submit time only the HTML, with data-tm-image placeholders instead of base64 sources,
+    has to cross from Chromium. Qt 5's channel only carries JSON, so images arrive as
+    their data URI text. The page only drops an image's source from submit content after
+    imageStaged confirms Python holds its bytes. The page also reports every edit, which
+    drives draft autosave.
+    """
+    content_changed = pyqtSignal()
+    imageStaged = pyqtSignal(str)     # placeholder id whose bytes Python holds, for the page
+    staging_finished = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-staging")
+        self.staged = {}
+        self.blobs = {}
+        # Emitted on the staging thread, delivered on the GUI thread the channel lives on
+        self.staging_finished.connect(self.imageStaged)
+
+    @pyqtSlot(str, str)
+    def stageImage(self, image_id, data_uri):
+        future = self.executor.submit(stage_image, data_uri, self.blobs)
+        future.add_done_callback(lambda future, image_id=image_id: self.on_staged(image_id, future))
+        self.staged[image_id] = future
+
+    def on_staged(self, image_id, future):
+        if not future.cancelled() and future.exception() is None and future.result() is not None:
+            self.staging_finished.emit(image_id)
+        else:
+            logger.warning(f"Pasted image {image_id} could not be staged; it is sent from the page instead")
+
+    @pyqtSlot()
+    def contentChanged(self):
+        self.content_changed.emit()
+
+    def staged_image(self, image_id):
+        """(mime subtype, bytes) for a staged placeholder, waiting for its decode if still running."""
+        future = self.staged.get(image_id)
+        if future is None:
+            return None
+        try:
+            staged = future.result()
+        except Exception as e:
+            logger.error(f"Staging pasted image {image_id} failed: {e}")
+            return None
+        return staged[:2] if staged else None
+
+    def staged_futures(self, description):
+        """Staging futures for the placeholders that appear in description."""
+        ids = {match.group(1) for match in STAGED_ATTR_RE.finditer(description)}
+        return {image_id: future for image_id, future in self.staged.items() if image_id in ids}
+
+    def clear(self):
+        # Pending decodes finish into dictionaries nobody references any more
+        self.staged = {}
+        self.blobs = {}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class EditorLifecycle(QObject):
+    """
+    Owns the web editor and keeps a single warm page for the life of the window.
+
+    QtWebEngine is imported and the page loaded the first time the editor is needed.
+    Clearing the form resets the content in place through setContent(''); editor.html
+    is only reloaded after the render process has died. Scripts run before the page
+    is interactive are queued, and the theme is remembered and re-applied on reload.
+    Pasted images reach Python through the EditorBridge registered on the page's channel.
+    While the window sits hidden, release() destroys the view and its renderer; the
+    next ensure() builds a fresh page and puts the content back.
+    """
+    interactive = pyqtSignal(float)
+
+    def __init__(self, layout, placeholder, dark_mode=False, parent=None):
+        super().__init__(parent)
+        self.layout = layout
+        self.placeholder = placeholder
+        self.dark_mode = dark_mode
+        self.view = None
+        self.ready = False
+        self.queue = []
+        self.load_started = None
+        self.time_to_interactive = None
+        self.page_loads = 0
+        self.editor_url = None
+        self.bridge = EditorBridge(self)
+        self.channel = None
+        self.pending_content = None
+        self.placeholder_height = placeholder.minimumHeight()
+
+    def ensure(self):
+        """Create the web view on first use, importing QtWebEngine only then."""
+        if self.view is not None:
+            return self.view
+        started = time.perf_counter()
+        from PyQt5.QtWebEngineWidgets import QWebEngineView
+        from PyQt5.QtWebChannel import QWebChannel
+
+        self.view = QWebEngineView()
+        self.channel = QWebChannel(self.view.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.view.page().setWebChannel(self.channel)
+        self.view.page().loadFinished.connect(self.on_loaded)
+        self.view.page().renderProcessTerminated.connect(self.on_render_process_terminated)
+        self.layout.replaceWidget(self.placeholder, self.view)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+        editor_path = resource_path("src/editor.html")
+        if os.path.exists(editor_path):
+            self.editor_url = QUrl.fromLocalFile(editor_path)
+        self.load()
+        if self.pending_content is not None:
+            self.queue.insert(0, (f"setContent({json.dumps(self.pending_content)});", None))
+            self.pending_content = None
+        logger.info(f"Web editor created in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return self.view
+
+    def load(self):
+        """(Re)load editor.html; only needed on creation and after a crash."""
+        self.ready = False
+        self.bridge.clear()
+        self.load_started = time.perf_counter()
+        self.page_loads += 1
+        if self.editor_url is not None:
+            self.view.setUrl(self.editor_url)
+        else:
+            self.view.setHtml("<h3>Editor file not found</h3>")
+
+    def on_loaded(self, ok):
+        """Apply the theme, then treat the page as interactive once that script round-trips."""
+        if not ok:
+            logger.warning("Editor page failed to load")
+        self.view.page().runJavaScript(f"setDarkMode({str(self.dark_mode).lower()});",
+                                       self.on_interactive)
+
+    def on_interactive(self, _result):
+        self.ready = True
+        self.time_to_interactive = (time.perf_counter() - self.load_started) * 1000
+        logger.info(f"Editor interactive {self.time_to_interactive:.0f} ms after load "
+                    f"(page load {self.page_loads})")
+        self.interactive.emit(self.time_to_interactive)
+        queued, self.queue = self.queue, []
+        for script, callback in queued:
+            self.run_script(script, callback)
+
+    def on_render_process_terminated(self, status, exit_code):
+        logger.warning(f"Editor render process terminated (status {int(status)}, "
+                       f"exit code {exit_code}); reloading editor page")
+        self.load()
+
+    def run_script(self, script, callback=None):
+        """Run JavaScript in the editor, or queue it until the editor is created and interactive."""
+        if not self.ready:
+            self.queue.append((script, callback))
+        elif callback is None:
+            self.view.page().runJavaScript(script)
+        else:
+            self.view.page().runJavaScript(script, callback)
+
+    def get_content(self, callback):
+        self.run_script("getContent()", callback)
+
+    def get_submit_content(self, callback):
+        """Editor HTML with staged images reduced to placeholders; resolve them with bridge.staged_image."""
+        self.run_script("getSubmitContent()", callback)
+
+    def set_content(self, content):
+        """Replace the editor HTML; without a page it is kept until the next ensure()."""
+        if self.view is None:
+            self.pending_content = content
+        else:
+            self.run_script(f"setContent({json.dumps(content)});")
+
+    def reset(self):
+        """Empty the editor in place; without a page only the content waiting for it is dropped."""
+        if self.view is None:
+            self.pending_content = None
+        else:
+            self.bridge.clear()
+            self.set_content("")
+
+    def release(self, description):
+        """
+        Destroy the web view and its Chromium render process.
+
+        description is the page's submit content; its staged images are inlined back so the
+        next ensure() rebuilds the page exactly as it was.
+        """
+        if self.view is None:
+            return
+        images = {}
+        for match in STAGED_ATTR_RE.finditer(description):
+            staged = self.bridge.staged_image(match.group(1))
+            if staged is not None:
+                images[match.group(1)] = staged
+        self.pending_content = inline_draft_images(description, images)
+        self.placeholder = QWidget()
+        self.placeholder.setMinimumHeight(self.placeholder_height)
+        self.layout.replaceWidget(self.view, self.placeholder)
+        self.view.deleteLater()  # takes the page and its channel with it
+        self.view = None
+        self.channel = None
+        self.ready = False
+        self.queue = []
+        self.bridge.clear()
+        logger.info("Web editor released while the window is hidden")
+
+    def set_dark_mode(self, dark_mode):
+        self.dark_mode = dark_mode
+        if self.ready:
+            self.view.page().runJavaScript(f"setDarkMode({str(dark_mode).lower()});")
+
+class PasteTextEdit(QTextEdit):
+    """QTextEdit that keeps pasted images as document resources staged through the editor bridge."""
+
+    def __init__(self, editor, parent=None):
+        super().__init__(parent)
+        self.editor = editor
+
+    def canInsertFromMimeData(self, source):
+        return source.hasImage() or super().canInsertFromMimeData(source)
+
+    def insertFromMimeData(self, source):
+        if not source.hasImage():
+            super().insertFromMimeData(source)
+            return
+        image = QImage(source.imageData())
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, "PNG")
+        self.textCursor().insertImage(self.editor.add_image("png", bytes(buffer.data()), image))
+
+class TextEditor(QObject):
+    """
+    Lightweight rich-text editor backend (TICKETMAKER_EDITOR=text) for machines where a
+    Chromium renderer is too heavy.
+
+    Offers the same interface as EditorLifecycle. Pasted images live in the QTextDocument
+    under tm-image:<id> names and are staged on the same EditorBridge, so submit content,
+    drafts and placeholder resolution work exactly as with the web editor.
+    """
+    interactive = pyqtSignal(float)
+
+    def __init__(self, layout, placeholder, dark_mode=False, parent=None):
+        super().__init__(parent)
+        self.layout = layout
+        self.placeholder = placeholder
+        self.dark_mode = dark_mode
+        self.view = None
+        self.ready = False
+        self.pending_content = None
+        self.bridge = EditorBridge(self)
+
+    def ensure(self):
+        if self.view is not None:
+            return self.view
+        started = time.perf_counter()
+        self.view = PasteTextEdit(self)
+        self.view.textChanged.connect(self.bridge.contentChanged)
+        self.layout.replaceWidget(self.placeholder, self.view)
+        self.placeholder.deleteLater()
+        self.placeholder = None
+        self.ready = True
+        self.set_dark_mode(self.dark_mode)
+        if self.pending_content is not None:
+            self.set_content(self.pending_content)
+            self.pending_content = None
+        elapsed = (time.perf_counter() - started) * 1000
+        logger.info(f"Text editor created in {elapsed:.0f} ms")
+        self.interactive.emit(elapsed)
+        return self.view
+
+    def add_image(self, subtype, content, image=None):
+        """Stage image bytes on the bridge and register them with the document; returns the resource name."""
+        image_id = uuid.uuid4().hex
+        self.bridge.staged[image_id] = self.bridge.executor.submit(stage_content, subtype, content, self.bridge.blobs)
+        if image is None:
+            image = QImage()
+            image.loadFromData(content)
+        name = f"{TEXT_EDITOR_IMAGE_SCHEME}:{image_id}"
+        self.view.document().addResource(QTextDocument.ImageResource, QUrl(name), image)
+        return name
+
+    def get_content(self, callback):
+        callback(self.view.toHtml())
+
+    def get_submit_content(self, callback):
+        """Document HTML with each image reduced to a data-tm-image placeholder."""
+
+        def placeholder(match):
+            src = SRC_ATTR_RE.search(match.group(0))
+            value = next((value for value in src.groups() if value is not None), "") if src else ""
+            if not value.startswith(f"{TEXT_EDITOR_IMAGE_SCHEME}:"):
+                return match.group(0)
+            return f'<img data-tm-image="{value.partition(":")[2]}" />'
+
+        callback(IMG_TAG_RE.sub(placeholder, self.view.toHtml()))
+
+    def set_content(self, content):
+        """Load editor HTML, turning data URI images into document resources."""
+        if self.view is None:
+            self.pending_content = content
+            return
+        self.bridge.clear()
+        self.view.document().clear()
+
+        def to_resource(match):
+            tag = match.group(0)
+            src = SRC_ATTR_RE.search(tag)
+            decoded = decode_data_uri(next(value for value in src.groups() if value is not None)) if src else None
+            if decoded is None:
+                return tag
+            return f'<img src="{self.add_image(*decoded)}" />'
+
+        self.view.setHtml(IMG_TAG_RE.sub(to_resource, content))
+
+    def reset(self):
+        if self.view is None:
+            self.pending_content = None
+        else:
+            self.set_content("")
+
+    def set_dark_mode(self, dark_mode):
+        self.dark_mode = dark_mode
+        if self.view is not None:
+            self.view.setStyleSheet("background-color: #1e1e1e; color: #d4d4d4; border: 1px solid #555;"
+                                    if dark_mode else "")
+
+class DraftStore:
+    """
+    Autosaved copy of the ticket form under STORAGE_PATH/drafts/<user>.
+
+    draft.json holds the fields and the editor HTML with pasted images reduced to
+    data-tm-image placeholders. Each image is written once to blobs/<sha256> and referenced
+    by digest, so re-saving a long, screenshot-heavy draft only rewrites a few KB. Writes
+    run in order on a background thread and replace draft.json atomically.
+    """
+
+    def __init__(self, path=DRAFTS_PATH):
+        self.path = path
+        self.draft_file = os.path.join(path, "draft.json")
+        self.blob_dir = os.path.join(path, "blobs")
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="draft-writer")
+        self.last_saved = None
+        # Last saved editor HTML and its image references, reused while the editor is not open
+        self.description = ""
+        self.references = {}
+
+    def save(self, draft, images):
+        """Queue a snapshot; images maps placeholder id -> future of (mime subtype, bytes, digest)."""
+        reuse = draft["description"] is None
+        if reuse:
+            draft["description"] = self.description
+        self.description = draft["description"]
+        return self.executor.submit(self.write, draft, images, reuse)
+
+    def write(self, draft, images, reuse=False):
+        try:
+            references = dict(self.references) if reuse else {}
+            for image_id, future in images.items():
+                staged = future.result()
+                if staged is None:
+                    logger.warning(f"Draft image {image_id} was not staged and is missing from the draft")
+                    continue
+                subtype, content, digest = staged
+                blob_path = os.path.join(self.blob_dir, digest)
+                if not os.path.exists(blob_path):
+                    os.makedirs(self.blob_dir, exist_ok=True)
+                    with open(f"{blob_path}.tmp", "wb") as f:
+                        f.write(content)
+                    os.replace(f"{blob_path}.tmp", blob_path)
+                references[image_id] = [subtype, digest]
+            draft["images"] = self.references = references
+
+            serialized = json.dumps(draft, sort_keys=True)
+            if serialized == self.last_saved:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            with open(f"{self.draft_file}.tmp", "w", encoding="utf-8") as f:
+                f.write(serialized)
+            os.replace(f"{self.draft_file}.tmp", self.draft_file)
+            self.last_saved = serialized
+            self.prune({digest for _, digest in references.values()})
+        except Exception as e:
+            logger.warning(f"Could not save draft: {e}")
+
+    def prune(self, keep):
+        """Delete blobs the current draft no longer references."""
+        try:
+            names = os.listdir(self.blob_dir)
+        except OSError:
+            return
+        for name in names:
+            if name not in keep:
+                try:
+                    os.remove(os.path.join(self.blob_dir, name))
+                except OSError:
+                    pass
+
+    def clear(self):
+        self.description = ""
+        self.executor.submit(self.remove)
+
+    def remove(self):
+        self.last_saved = None
+        self.references = {}
+        try:
+            os.remove(self.draft_file)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove draft: {e}")
+        self.prune(set())
+
+    def load(self):
+        """The saved draft with its images inlined as data URIs, or None if there is none."""
+        try:
+            with open(self.draft_file, encoding="utf-8") as f:
+                draft = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable draft: {e}")
+            return None
+        self.last_saved = json.dumps(draft, sort_keys=True)
+        self.description = draft.get("description") or ""
+        self.references = draft.get("images") or {}
+        images = {}
+        for image_id, (subtype, digest) in self.references.items():
+            try:
+                with open(os.path.join(self.blob_dir, digest), "rb") as f:
+                    images[image_id] = (subtype, f.read())
+            except OSError as e:
+                logger.warning(f"Draft image {digest} is missing: {e}")
+        draft["description"] = inline_draft_images(self.description, images)
+        return draft
+
+    def close(self):
+        """Wait for queued writes so the last snapshot reaches disk."""
+        self.executor.shutdown(wait=True)
+
+class SubmissionStatsDialog(QDialog):
+    """Per-phase p50/p95 over the last submissions."""
+
+    def __init__(self, metrics, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics
+        self.setWindowTitle("Submission Stats")
+        self.resize(460, 420)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Phase", "Samples", "p50 (ms)", "p95 (ms)"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+        refresh_button = QPushButton("Refresh")
+        refresh_button.clicked.connect(self.refresh)
+        layout.addWidget(refresh_button)
+        self.refresh()
+
+    def refresh(self):
+        count, outcomes, phases = self.metrics.summary()
+        outcome_text = ", ".join(f"{number} {outcome}" for outcome, number in outcomes.most_common())
+        self.summary_label.setText(f"Last {count} submission(s)" + (f": {outcome_text}" if outcome_text else ""))
+        self.table.setRowCount(len(phases))
+        for row, (phase, samples, p50, p95) in enumerate(phases):
+            for column, value in enumerate([phase, str(samples), f"{p50:.1f}", f"{p95:.1f}"]):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+
+class HistoryModel(QAbstractTableModel):
+    """
+    Table model over TicketHistory that loads rows a page at a time.
+
+    Views call canFetchMore()/fetchMore() as they scroll, so only the rows scrolled into
+    reach are ever read from SQLite.
+    """
+    COLUMNS = ["Ticket", "Subject", "Status", "Priority", "Created", "Updated"]
+
+    def __init__(self, history, status_labels=None, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.status_labels = status_labels or {}
+        self.priority_labels = {value: name.capitalize() for name, value in PRIORITIES.items()}
+        self.rows = []
+        self.total = history.count()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        ticket_id, subject, status, priority, created_at, updated_at = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            return f"#{ticket_id}"
+        if column == 1:
+            return subject
+        if column == 2:
+            return self.status_labels.get(status, str(status or ""))
+        if column == 3:
+            return self.priority_labels.get(priority, str(priority or ""))
+        timestamp = created_at if column == 4 else updated_at
+        return (timestamp or "").replace("T", " ").rstrip("Z")
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.rows) < self.total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        rows = self.history.page(self.rows[-1][0] if self.rows else None)
+        if not rows:
+            self.total = len(self.rows)
+            return
+        self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows.extend(rows)
+        self.endInsertRows()
+
+    def ticket_id(self, row):
+        return self.rows[row][0]
+
+    def reload(self):
+        """Drop the loaded rows after the history changed; the view fetches the first page again."""
+        self.beginResetModel()
+        self.rows = []
+        self.total = self.history.count()
+        self.endResetModel()
+
+class HistoryDialog(QDialog):
+    """'My Tickets': tickets created from this machine with their current status."""
+
+    def __init__(self, model, base_url, parent=None):
+        super().__init__(parent)
+        self.model = model
+        self.base_url = base_url
+        self.setWindowTitle("My Tickets")
+        self.resize(760, 480)
+        layout = QVBoxLayout(self)
+        self.table = QTableView()
+        self.table.setModel(model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self.open_ticket)
+        layout.addWidget(self.table)
+        layout.addWidget(QLabel("Double-click a ticket to open it in Freshdesk."))
+
+    def open_ticket(self, index):
+        ticket_id = self.model.ticket_id(index.row())
+        QDesktopServices.openUrl(QUrl(f"{self.base_url}/helpdesk/tickets/{ticket_id}"))
+
+class StartupProfile:
+    """Wall-clock time spent in each startup phase, for --profile-startup."""
+
+    def __init__(self, started):
+        self.started = started
+        self.last = started
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        lines = [f"{phase:<32} {elapsed * 1000:8.1f} ms" for phase, elapsed in self.phases]
+        lines.append(f"{'total':<32} {(self.last - self.started) * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="TicketMaker", description="Create Freshdesk tickets.")
+    subcommands = parser.add_subparsers(dest="command")
+    bulk = subcommands.add_parser("import", help="Create tickets from a CSV or JSONL file without the GUI.")
+    bulk.add_argument("file", help="CSV or JSONL with subject, email, description, priority, status, attachments")
+    bulk.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS, help="concurrent requests")
+    bulk.add_argument("--checkpoint", help="progress file used to resume (default: <file>.checkpoint.jsonl)")
+    # SUPPRESS keeps an --email given before "import" instead of resetting it to None
+    bulk.add_argument("--email", default=argparse.SUPPRESS, help="requester email for rows without one")
+    bulk.add_argument("--priority", default="low", help="default priority name or number")
+    bulk.add_argument("--status", default="open", help="default status name or number")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print how long each startup phase takes, then exit")
+    parser.add_argument("--subject", help="prefill the ticket subject")
+    parser.add_argument("--email", help="prefill the requester email")
+    parser.add_argument("--attach", action="append", default=[], metavar="FILE",
+                        help="prefill an attachment (repeatable)")
+    # Qt consumes its own options (-style etc.), so ignore anything unknown
+    args, _ = parser.parse_known_args(argv)
+    return args
+
 # Main App Class
 class TicketCreator(QMainWindow):
-    def __init__(self, config):
+    def __init__(self, config, profiling=False):
         super().__init__()
         self.config = config
-        logger.debug(f"TicketCreator initialized with config: {self.config}")
+        # --profile-startup runs next to the real instance: build the UI, but leave the
+        # outbox, the draft, the local endpoints and every Freshdesk sync to that instance
+        self.profiling = profiling
+        logger.debug(f"TicketCreator initialized for {self.config['api_url']}")
         self.attachments = []
+        self.description = ""
+        self.embedded_images = []
+
+        # Tickets go through the durable outbox and are sent by a background drainer
+        self.thread_pool = QThreadPool()
+        self.thread_pool.setMaxThreadCount(MAX_CONCURRENT_SUBMISSIONS)
+        self.client = FreshdeskClient(self.config["api_url"], self.config["api_key"])
+        self.outbox = Outbox()
+        self.drainer = OutboxDrainer(self.outbox, self.client, self.thread_pool, self)
+        self.preparing = 0
+        self.last_bytes_saved = 0
+        self.metrics = SubmissionMetrics()
+        self.metrics_server = None if profiling else start_metrics_server(self.metrics)
+        self.ingest_server = None
+        if INGEST_PORT and not profiling:
+            try:
+                ingest_token = load_ingest_token()
+            except OSError as e:
+                logger.warning(f"Ingestion endpoint disabled, no token available: {e}")
+            else:
+                register_log_secret(ingest_token)
+                self.ingest_server = IngestServer(self.outbox, INGEST_PORT, ingest_token, self)
+                self.ingest_server.queued.connect(self.on_api_tickets_queued)
+                self.ingest_server.start()
+        self.submit_trace = None
+        self.drafts = DraftStore()
+        self.contact_index = ContactIndex()
+        self.metadata_cache = MetadataCache()
+        self.metadata_timer = QTimer(self)
+        self.metadata_timer.timeout.connect(self.refresh_metadata)
+        self.ticket_index = TicketIndex()
+        self.history = TicketHistory()
+        self.history_model = None
+        self.history_dialog = None
+        self.ticket_index_timer = QTimer(self)
+        self.ticket_index_timer.timeout.connect(self.sync_ticket_index)
+        self.duplicate_timer = QTimer(self)
+        self.duplicate_timer.setSingleShot(True)
+        self.duplicate_timer.setInterval(DUPLICATE_CHECK_DELAY_MS)
+        self.duplicate_timer.timeout.connect(self.check_duplicates)
+        self.draft_timer = QTimer(self)
+        self.draft_timer.setSingleShot(True)
+        self.draft_timer.setInterval(DRAFT_SAVE_DELAY_MS)
+        self.draft_timer.timeout.connect(self.save_draft)
+        self.editor_idle_timer = QTimer(self)
+        self.editor_idle_timer.setSingleShot(True)
+        self.editor_idle_timer.setInterval(int(EDITOR_IDLE_RELEASE_MINUTES * 60 * 1000))
+        self.editor_idle_timer.timeout.connect(self.release_editor)
+        self.exiting = False
+
         self.init_ui()
         self.apply_theme()
 
+        self.drainer.progress.connect(self.on_submission_progress)
+        self.drainer.created.connect(self.on_ticket_created)
+        self.drainer.delayed.connect(self.on_ticket_delayed)
+        self.drainer.rejected.connect(self.on_ticket_rejected)
+        self.drainer.cancelled.connect(self.on_ticket_cancelled)
+        self.drainer.changed.connect(self.update_outbox_status)
+        self.drainer.attempted.connect(self.metrics.attempt_finished)
+
+        # Autosave the form a moment after the last edit
+        self.subject_input.textChanged.connect(self.draft_timer.start)
+        self.email_input.textChanged.connect(self.draft_timer.start)
+        self.priority_dropdown.currentIndexChanged.connect(self.draft_timer.start)
+        self.status_dropdown.currentIndexChanged.connect(self.draft_timer.start)
+        self.group_dropdown.currentIndexChanged.connect(self.draft_timer.start)
+        self.type_dropdown.currentIndexChanged.connect(self.draft_timer.start)
+        self.editor.bridge.content_changed.connect(self.draft_timer.start)
+        if not profiling:
+            QTimer.singleShot(0, self.restore_draft)
+
+        # Dropdown choices, contacts and the duplicate index come from the on-disk cache,
+        # refreshed in the background while the window is open (see resume_background_sync)
+        self.metadata_refreshed = None
+        self.ticket_index_synced = None
+
+        # Similar open tickets are looked up locally while the subject is typed
+        self.subject_input.textChanged.connect(self.duplicate_timer.start)
+
+        # Resume anything left in the outbox by a previous run, once the tray is up
+        if not profiling:
+            QTimer.singleShot(0, self.drainer.drain)
+        self.update_restore_action()
+
         # Start minimized to system tray
         self.hide()
 
@@ -159,6 +3231,12 @@ class TicketCreator(QMainWindow):
         tray_menu = QMenu()
         open_action = tray_menu.addAction("Open TicketMaker")
         open_action.triggered.connect(self.show_normal)  # Adjusted to reuse show_normal()
+        history_action = tray_menu.addAction("My Tickets")
+        history_action.triggered.connect(self.show_history)
+        stats_action = tray_menu.addAction("Submission Stats")
+        stats_action.triggered.connect(self.show_submission_stats)
+        self.restore_action = tray_menu.addAction("Restore Failed Ticket")
+        self.restore_action.triggered.connect(self.restore_held_ticket)
         exit_action = tray_menu.addAction("Exit")
         exit_action.triggered.connect(self.exit_application)
         self.tray_icon.setContextMenu(tray_menu)
@@ -176,34 +3254,54 @@ class TicketCreator(QMainWindow):
         layout.addWidget(QLabel("Subject:"))
         self.subject_input = QLineEdit(placeholderText="Enter the ticket subject here")
         layout.addWidget(self.subject_input)
+        self.duplicates_label = QLabel()
+        self.duplicates_label.setWordWrap(True)
+        self.duplicates_label.setOpenExternalLinks(True)
+        self.duplicates_label.setVisible(False)
+        layout.addWidget(self.duplicates_label)
 
         # Email Field
         layout.addWidget(QLabel("Your Email:"))
         self.email_input = QLineEdit(placeholderText="Enter your email address")
+        self.email_completions = QStringListModel(self)
+        self.email_completer = QCompleter(self.email_completions, self)
+        self.email_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.email_input.setCompleter(self.email_completer)
+        self.email_input.textEdited.connect(self.complete_email)
         layout.addWidget(self.email_input)
 
-        # Rich Text Editor
+        # Rich Text Editor (Chromium is only started the first time the window is shown)
         layout.addWidget(QLabel("Description:"))
-        self.editor = QWebEngineView()
-        editor_path = resource_path("src/editor.html")
-        if os.path.exists(editor_path):
-            self.editor.setUrl(QUrl.fromLocalFile(editor_path))
-        else:
-            self.editor.setHtml("<h3>Editor file not found</h3>")
-        layout.addWidget(self.editor)
+        editor_placeholder = QWidget()
+        editor_placeholder.setMinimumHeight(400)
+        layout.addWidget(editor_placeholder)
+        editor_backend = TextEditor if EDITOR_BACKEND == "text" else EditorLifecycle
+        self.editor = editor_backend(layout, editor_placeholder, parent=self)
 
         # Priority Dropdown
         layout.addWidget(QLabel("Priority:"))
         self.priority_dropdown = QComboBox()
-        self.priority_dropdown.addItems(["Low", "Medium", "High", "Urgent"])
+        self.set_choices(self.priority_dropdown, [(name.capitalize(), value) for name, value in PRIORITIES.items()])
         layout.addWidget(self.priority_dropdown)
 
         # Status Dropdown
         layout.addWidget(QLabel("Status:"))
         self.status_dropdown = QComboBox()
-        self.status_dropdown.addItems(["Open", "Pending", "Resolved", "Closed"])
+        self.set_choices(self.status_dropdown, [(name.capitalize(), value) for name, value in STATUSES.items()])
         layout.addWidget(self.status_dropdown)
 
+        # Group and Type Dropdowns, shown once the helpdesk's ticket fields are known
+        self.group_label = QLabel("Group:")
+        self.group_dropdown = QComboBox()
+        self.type_label = QLabel("Type:")
+        self.type_dropdown = QComboBox()
+        for label, dropdown in ((self.group_label, self.group_dropdown), (self.type_label, self.type_dropdown)):
+            self.set_choices(dropdown, [("None", None)])
+            label.hide()
+            dropdown.hide()
+            layout.addWidget(label)
+            layout.addWidget(dropdown)
+
         # Attachments
         self.attachment_label = QLabel("Attachments:")
         self.attachment_button = QPushButton("Add Attachments")
@@ -221,6 +3319,18 @@ class TicketCreator(QMainWindow):
         self.clear_button.clicked.connect(self.clear_fields)
         layout.addWidget(self.clear_button)
 
+        # Upload Progress (hidden while nothing is uploading)
+        self.upload_label = QLabel("")
+        self.upload_progress = QProgressBar()
+        self.cancel_upload_button = QPushButton("Cancel Upload")
+        self.cancel_upload_button.clicked.connect(self.cancel_submissions)
+        upload_row = QHBoxLayout()
+        upload_row.addWidget(self.upload_progress)
+        upload_row.addWidget(self.cancel_upload_button)
+        layout.addWidget(self.upload_label)
+        layout.addLayout(upload_row)
+        self.set_upload_widgets_visible(False)
+
         # Set Main Layout
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
@@ -245,6 +3355,8 @@ class TicketCreator(QMainWindow):
             self.email_input.setStyleSheet("background-color: #2b2b2b; color: #ffffff; border: 1px solid #555;")
             self.priority_dropdown.setStyleSheet("background-color: #2b2b2b; color: #ffffff; border: 1px solid #555;")
             self.status_dropdown.setStyleSheet("background-color: #2b2b2b; color: #ffffff; border: 1px solid #555;")
+            self.group_dropdown.setStyleSheet("background-color: #2b2b2b; color: #ffffff; border: 1px solid #555;")
+            self.type_dropdown.setStyleSheet("background-color: #2b2b2b; color: #ffffff; border: 1px solid #555;")
             self.attachment_button.setStyleSheet("background-color: #3c3c3c; color: #ffffff; border: 1px solid #555;")
             self.submit_button.setStyleSheet("background-color: #3c3c3c; color: #ffffff; border: 1px solid #555;")
             self.clear_button.setStyleSheet("background-color: #3c3c3c; color: #ffffff; border: 1px solid #555;")
@@ -274,6 +3386,8 @@ class TicketCreator(QMainWindow):
             self.email_input.setStyleSheet("")
             self.priority_dropdown.setStyleSheet("")
             self.status_dropdown.setStyleSheet("")
+            self.group_dropdown.setStyleSheet("")
+            self.type_dropdown.setStyleSheet("")
             self.attachment_button.setStyleSheet("")
             self.submit_button.setStyleSheet("")
             self.clear_button.setStyleSheet("")
@@ -298,12 +3412,118 @@ class TicketCreator(QMainWindow):
             """)
 
         app.setPalette(palette)
-
-        # Wait for the editor page to load before applying dark mode
-        def set_editor_mode():
-            self.editor.page().runJavaScript(f"setDarkMode({str(is_dark_mode).lower()});")
-
-        self.editor.page().loadFinished.connect(set_editor_mode)
+        self.editor.set_dark_mode(is_dark_mode)
+
+    def set_choices(self, dropdown, choices):
+        """Fill a dropdown with (label, Freshdesk value) pairs, keeping the selected value if it still exists."""
+        current = dropdown.currentData()
+        dropdown.blockSignals(True)
+        dropdown.clear()
+        for label, value in choices:
+            dropdown.addItem(label, value)
+        dropdown.blockSignals(False)
+        self.select_choice(dropdown, current)
+
+    def select_choice(self, dropdown, value):
+        dropdown.setCurrentIndex(max(0, dropdown.findData(value)))
+
+    def select_optional_choice(self, dropdown, value):
+        """Select a group or type value, keeping it even if the field's choices have not arrived yet."""
+        if value is not None and dropdown.findData(value) < 0:
+            dropdown.addItem(str(value), value)
+        self.select_choice(dropdown, value)
+
+    def resume_background_sync(self):
+        """Refresh metadata and the duplicate index while the window is open; an instance left in the tray fetches nothing."""
+        if self.profiling:
+            return
+        now = time.monotonic()
+        if self.metadata_refreshed is None or now - self.metadata_refreshed >= METADATA_REFRESH_INTERVAL:
+            self.refresh_metadata()
+        self.metadata_timer.start(METADATA_REFRESH_INTERVAL * 1000)
+        if self.ticket_index_synced is None:
+            self.sync_ticket_index(publish_cached=True)
+        elif now - self.ticket_index_synced >= DUPLICATE_SYNC_INTERVAL:
+            self.sync_ticket_index()
+        self.ticket_index_timer.start(DUPLICATE_SYNC_INTERVAL * 1000)
+
+    def refresh_metadata(self):
+        self.metadata_refreshed = time.monotonic()
+        refresh = MetadataRefresh(self.client, self.metadata_cache)
+        refresh.signals.ticket_fields.connect(self.on_ticket_fields)
+        refresh.signals.contacts.connect(self.on_contacts)
+        QThreadPool.globalInstance().start(refresh)
+
+    def on_ticket_fields(self, fields):
+        for dropdown, name in ((self.priority_dropdown, "priority"), (self.status_dropdown, "status")):
+            choices = field_choices(fields, name)
+            if choices:
+                self.set_choices(dropdown, choices)
+        for label, dropdown, name in ((self.group_label, self.group_dropdown, "group"),
+                                      (self.type_label, self.type_dropdown, "ticket_type")):
+            choices = field_choices(fields, name)
+            if choices:
+                self.set_choices(dropdown, [("None", None)] + choices)
+                label.show()
+                dropdown.show()
+
+    def sync_ticket_index(self, publish_cached=False):
+        self.ticket_index_synced = time.monotonic()
+        refresh = TicketIndexRefresh(self.client, self.metadata_cache, publish_cached, self.history)
+        refresh.signals.indexed.connect(self.on_ticket_index)
+        refresh.signals.history_changed.connect(self.on_history_changed)
+        QThreadPool.globalInstance().start(refresh)
+
+    def on_ticket_index(self, index):
+        self.ticket_index = index
+        self.check_duplicates()
+
+    def check_duplicates(self):
+        """Show open tickets similar to the subject being typed."""
+        started = time.perf_counter()
+        matches = self.ticket_index.search(self.subject_input.text())
+        elapsed = (time.perf_counter() - started) * 1000
+        if elapsed > 10:
+            logger.warning(f"Duplicate check took {elapsed:.1f} ms over {len(self.ticket_index)} tickets")
+        if not matches:
+            self.duplicates_label.setVisible(False)
+            return
+        base_url = self.client.base_url[:-len("/api/v2")]
+        links = "<br>".join(
+            f'<a href="{base_url}/helpdesk/tickets/{ticket_id}">#{ticket_id}</a> {html.escape(subject)}'
+            for _, ticket_id, subject, _ in matches
+        )
+        self.duplicates_label.setText(f"Similar open tickets:<br>{links}")
+        self.duplicates_label.setVisible(True)
+
+    def on_contacts(self, index):
+        self.contact_index = index
+
+    def complete_email(self, text):
+        matches = self.contact_index.complete(text)
+        self.email_completions.setStringList(matches)
+        if matches:
+            self.email_completer.complete()
+
+    def show_history(self):
+        if self.history_dialog is None:
+            self.history_model = HistoryModel(self.history, self.status_labels(), self)
+            self.history_dialog = HistoryDialog(self.history_model, self.client.base_url[:-len("/api/v2")], self)
+        self.history_dialog.show()
+        self.history_dialog.raise_()
+        self.history_dialog.activateWindow()
+
+    def status_labels(self):
+        return {self.status_dropdown.itemData(i): self.status_dropdown.itemText(i)
+                for i in range(self.status_dropdown.count())}
+
+    def on_history_changed(self, changed=0):
+        if self.history_model is not None:
+            self.history_model.status_labels = self.status_labels()
+            self.history_model.reload()
+
+    def show_submission_stats(self):
+        SubmissionStatsDialog(self.metrics, self).exec_()
 
     def tray_icon_activated(self, reason):
         """Handle tray icon activation."""
@@ -315,6 +3535,46 @@ class TicketCreator(QMainWindow):
         self.show()
         self.activateWindow()
 
+    def handle_handoff(self, message):
+        """Show the window for another launch, prefilling whatever it passed along."""
+        logger.info(f"Handoff received: subject={message.get('subject')}, attachments={len(message.get('attachments') or [])}")
+        if message.get("subject"):
+            self.subject_input.setText(message["subject"])
+        if message.get("email"):
+            self.email_input.setText(message["email"])
+        attachments = [path for path in message.get("attachments") or [] if os.path.isfile(path)]
+        if attachments:
+            self.attachments.extend(attachments)
+            self.attachment_label.setText(f"{len(self.attachments)} attachment(s) added")
+        self.show_normal()
+        self.raise_()
+
+    def showEvent(self, event):
+        self.editor_idle_timer.stop()
+        self.editor.ensure()
+        self.resume_background_sync()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        if EDITOR_IDLE_RELEASE_MINUTES > 0 and isinstance(self.editor, EditorLifecycle):
+            self.editor_idle_timer.start()
+        self.metadata_timer.stop()
+        self.ticket_index_timer.stop()
+        super().hideEvent(event)
+
+    def release_editor(self):
+        """Free the web editor's renderer after the window sat hidden, snapshotting the draft first."""
+        if self.isVisible() or self.exiting or not self.editor.ready:
+            return
+        self.draft_timer.stop()
+        self.editor.get_submit_content(self.on_editor_snapshot)
+
+    def on_editor_snapshot(self, description):
+        if self.isVisible() or self.exiting:
+            return  # shown again while the page was being read
+        self.store_draft(description)
+        self.editor.release(description or "")
+
     def closeEvent(self, event):
         """Override close event to minimize to tray instead of exiting."""
         event.ignore()
@@ -333,37 +3593,119 @@ class TicketCreator(QMainWindow):
             print("Tray icon hidden. Application exiting.")
         except Exception as e:
             print(f"Error during application exit: {e}")
-        
+
+        # Snapshot the form one last time; don't let a hung editor page keep the app alive
+        self.exiting = True
+        self.draft_timer.stop()
+        if self.profiling:
+            self.quit_application()  # the empty form must not replace the real instance's draft
+            return
+        self.save_draft()
+        QTimer.singleShot(2000, self.quit_application)
+
+    def quit_application(self):
+        if image_pool is not None:
+            image_pool.shutdown(wait=False, cancel_futures=True)
+        self.drafts.close()
+        self.editor.bridge.shutdown()
+        if self.ingest_server is not None:
+            self.ingest_server.stop()
         QApplication.quit()
 
+    def save_draft(self):
+        """Snapshot the form into the draft store, reading the editor only if it was ever opened."""
+        if self.editor.view is None:
+            self.store_draft(None)
+        else:
+            self.editor.get_submit_content(self.store_draft)
+
+    def store_draft(self, description):
+        draft = {
+            "subject": self.subject_input.text(),
+            "email": self.email_input.text(),
+            "priority": self.priority_dropdown.currentData(),
+            "status": self.status_dropdown.currentData(),
+            "group_id": self.group_dropdown.currentData(),
+            "type": self.type_dropdown.currentData(),
+            "attachments": list(self.attachments),
+            "description": description,
+        }
+        saved_description = description if description is not None else self.drafts.description
+        if not (draft["subject"] or draft["email"] or draft["attachments"]) and is_blank_html(saved_description):
+            self.drafts.clear()
+        else:
+            self.drafts.save(draft, self.editor.bridge.staged_futures(description or ""))
+        if self.exiting:
+            self.quit_application()
+
+    def restore_draft(self):
+        """Put the draft left by the previous run back into the form."""
+        draft = self.drafts.load()
+        if not draft:
+            return
+        if self.subject_input.text() or self.email_input.text() or self.attachments:
+            logger.info("Form was prefilled by another launch; not restoring the saved draft")
+            return
+        self.subject_input.setText(draft.get("subject", ""))
+        self.email_input.setText(draft.get("email", ""))
+        self.select_choice(self.priority_dropdown, draft.get("priority"))
+        self.select_choice(self.status_dropdown, draft.get("status"))
+        self.select_optional_choice(self.group_dropdown, draft.get("group_id"))
+        self.select_optional_choice(self.type_dropdown, draft.get("type"))
+        self.attachments = [path for path in draft.get("attachments") or [] if os.path.isfile(path)]
+        if self.attachments:
+            self.attachment_label.setText(f"{len(self.attachments)} attachment(s) added")
+        if draft.get("description"):
+            self.editor.set_content(draft["description"])
+        logger.info("Restored the unsent draft from the last session")
+        self.tray_icon.showMessage("TicketMaker", "Your unsent ticket draft was restored.",
+                                   QSystemTrayIcon.Information, 3000)
+
     def create_ticket(self):
         subject = self.subject_input.text().strip()
         email = self.email_input.text().strip()
         if not subject or not email:
             QMessageBox.critical(self, "Error", "Subject and Email are required!")
             return
-        self.editor.page().runJavaScript("getContent()", self.handle_description_content)
+        self.submit_trace = SubmissionTrace()
+        self.editor.get_submit_content(self.handle_description_content)
 
     def clear_fields(self):
         """Clear all input fields and reset the form."""
         self.subject_input.clear()
         self.email_input.clear()
 
-        # Reset the editor's content without affecting its visibility
-        if os.path.exists(resource_path("src/editor.html")):
-            self.editor.setUrl(QUrl.fromLocalFile(resource_path("src/editor.html")))
-        else:
-            self.editor.setHtml("<h3>Editor file not found</h3>")
+        # Empty the warm editor page in place rather than reloading editor.html
+        self.editor.reset()
 
         # Reset dropdowns and attachments
-        self.priority_dropdown.setCurrentIndex(0)
-        self.status_dropdown.setCurrentIndex(0)
+        self.select_choice(self.priority_dropdown, PRIORITIES["low"])
+        self.select_choice(self.status_dropdown, STATUSES["open"])
+        self.select_choice(self.group_dropdown, None)
+        self.select_choice(self.type_dropdown, None)
         self.attachments = []
         self.attachment_label.setText("Attachments:")
+        self.draft_timer.start()
 
-    def handle_description_content(self, description):
-        self.description = description
-        self.embedded_images = self.extract_embedded_images(description)
+    def handle_description_content(self, description, staged=True):
+        trace = self.submit_trace = self.submit_trace or SubmissionTrace()
+        trace.add("editor_content", time.perf_counter() - trace.origin)
+        try:
+            with trace.span("extract_images"):
+                self.description, self.embedded_images = extract_embedded_images(
+                    description or "", self.editor.bridge.staged_image if staged else None)
+        except UnresolvedImage as e:
+            # Read the page again with every image source intact
+            logger.warning(f"{e}; reading the full editor content instead")
+            self.editor.get_content(lambda content: self.handle_description_content(content, staged=False))
+            return
+        trace.sizes["pasted_description_bytes"] = len(self.description.encode("utf-8"))
+        with trace.span("compact_html"):
+            self.description = compact_html(self.description)
+        if not self.embedded_images and is_blank_html(self.description):
+            self.description = ""  # build_ticket_data says "No description provided" instead
+        trace.sizes["description_bytes"] = len(self.description.encode("utf-8"))
+        trace.sizes["embedded_images"] = len(self.embedded_images)
         self.send_ticket()
 
     def add_attachments(self):
@@ -371,29 +3713,20 @@ class TicketCreator(QMainWindow):
         if files:
             self.attachments.extend(files)
             self.attachment_label.setText(f"{len(self.attachments)} attachment(s) added")
-
-    def extract_embedded_images(self, description):
-        embedded_images = []
-        matches = re.findall(r'<img src="data:image/(.*?);base64,(.*?)"', description)
-        for idx, (img_type, img_data) in enumerate(matches):
-            file_name = f"embedded_image_{idx + 1}.{img_type}"
-            file_path = os.path.join(os.getcwd(), file_name)
-            with open(file_path, "wb") as img_file:
-                img_file.write(base64.b64decode(img_data))
-            embedded_images.append(file_path)
-        return embedded_images
+            self.draft_timer.start()
 
     def send_ticket(self):
-        """Send the ticket data to the Freshdesk API with or without attachments."""
+        """Queue the ticket in the durable outbox and let the background drainer send it."""
         try:
             logger.info("Initiating ticket creation process...")
 
             # Prepare ticket details
             subject = self.subject_input.text().strip()
             email = self.email_input.text().strip()
-            description = self.description or "No description provided"
-            priority = self.priority_dropdown.currentIndex() + 1
-            status = self.status_dropdown.currentIndex() + 2
+            priority = self.priority_dropdown.currentData()
+            status = self.status_dropdown.currentData()
+            group_id = self.group_dropdown.currentData()
+            ticket_type = self.type_dropdown.currentData()
 
             if not subject or not email:
                 logger.error("Subject or Email is missing!")
@@ -402,101 +3735,244 @@ class TicketCreator(QMainWindow):
 
             logger.info(f"Ticket details: subject={subject}, email={email}, priority={priority}, status={status}")
 
-            # Prepare ticket data
-            data = {
-                "email": email,
-                "subject": subject,
-                "description": description,
-                "priority": priority,  # Keep as integer
-                "status": status       # Keep as integer
-            }
+            data = build_ticket_data(subject, email, self.description, priority, status, group_id, ticket_type)
 
-            # Log data being sent
-            logger.info(f"Data to be sent: {data}")
-
-            # Prepare attachments
-            files = []
-            has_attachments = bool(self.attachments or self.embedded_images)
-            if has_attachments:
-                try:
-                    for attachment in self.attachments:
-                        logger.info(f"Processing attachment: {attachment}")
-                        files.append(("attachments[]", (os.path.basename(attachment), open(attachment, "rb"))))
-
-                    for idx, embedded_image in enumerate(self.embedded_images):
-                        file_name = f"embedded_image_{idx + 1}.png"
-                        missing_padding = len(embedded_image) % 4
-                        if missing_padding != 0:
-                            embedded_image += "=" * (4 - missing_padding)
-
-                        with open(file_name, "wb") as img_file:
-                            img_file.write(base64.b64decode(embedded_image))
-                        files.append(("attachments[]", (file_name, open(file_name, "rb"))))
-                except Exception as attachment_error:
-                    logger.error(f"Error processing attachments: {attachment_error}")
-                    QMessageBox.warning(self, "Warning", f"Could not process attachments or embedded images:\n{attachment_error}")
-                    return
-
-            # API headers
-            credentials = f"{self.config['api_key']}:X"
-            encoded_credentials = base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
-            headers = {
-                "Authorization": f"Basic {encoded_credentials}"
-            }
-
-            logger.info(f"Headers: {headers}")
-
-            # API URL
-            api_url = f"https://{self.config['api_url'].rstrip('/')}/api/v2/tickets"
-            logger.info(f"API URL: {api_url}")
-
-            # Send API request
-            response = None
+            trace, self.submit_trace = self.submit_trace or SubmissionTrace(), None
             try:
-                if has_attachments:
-                    response = requests.post(api_url, headers=headers, data=data, files=files)
-                else:
-                    headers["Content-Type"] = "application/json"
-                    response = requests.post(api_url, headers=headers, json=data)
-
-                logger.info(f"Response status code: {response.status_code}")
-                logger.info(f"Response body: {response.text}")
-
-                # Handle API response
-                if response.status_code == 201:
-                    QMessageBox.information(self, "Success", "Ticket created successfully!")
-                    self.clear_fields()
-                else:
-                    error_message = response.json().get("message", response.text)
-                    logger.error(f"API returned an error: {error_message}")
-                    QMessageBox.critical(self, "Error", f"Failed to create ticket: {error_message}")
-            except Exception as request_error:
-                logger.error(f"Error making API request: {request_error}")
-                QMessageBox.critical(self, "Error", f"Failed to communicate with Freshdesk: {request_error}")
-            finally:
-                # Cleanup embedded images and file handles
-                for file_path in self.embedded_images:
-                    try:
-                        os.remove(file_path)
-                    except Exception:
-                        pass
-                for _, (_, file_handle) in files:
-                    try:
-                        file_handle.close()
-                    except Exception:
-                        pass
+                # Embedded images only shrink from here, so just the attachments can be checked now
+                with trace.span("validate"):
+                    body_bytes, _ = check_payload_budget(data, [(None, path, None) for path in self.attachments])
+                trace.sizes["body_bytes"] = body_bytes
+                trace.sizes["attachments"] = len(self.attachments)
+            except (OSError, AttachmentTooLarge) as attachment_error:
+                logger.error(f"Error processing attachments: {attachment_error}")
+                QMessageBox.warning(self, "Warning", f"Could not process attachments or embedded images:\n{attachment_error}")
+                return
+
+            if self.embedded_images:
+                preparation = TicketPreparation(data, self.attachments, self.embedded_images, trace)
+                preparation.signals.prepared.connect(
+                    lambda data, images, saved, attachments=list(self.attachments):
+                        self.on_ticket_prepared(data, attachments, images, saved, trace))
+                preparation.signals.failed.connect(self.on_ticket_rejected_before_queue)
+                self.preparing += 1
+                self.thread_pool.start(preparation)
+            else:
+                self.queue_ticket(data, self.attachments, [], 0, trace)
+
+            # The form is free for the next ticket while this one uploads
+            self.embedded_images = []
+            self.clear_fields()
+            self.update_outbox_status()
         except Exception as general_error:
             logger.critical(f"Unexpected error in send_ticket(): {general_error}")
             QMessageBox.critical(self, "Critical Error", f"An unexpected error occurred:\n{general_error}")
 
+    def on_ticket_prepared(self, data, attachments, images, saved, trace=None):
+        self.preparing -= 1
+        self.queue_ticket(data, attachments, images, saved, trace)
+
+    def queue_ticket(self, data, attachments, images, saved, trace=None):
+        """Write a prepared ticket to the outbox and start sending it."""
+        trace = trace or SubmissionTrace()
+        with trace.span("enqueue"):
+            ticket_id = self.outbox.enqueue(data, attachments, images)
+        logger.info(f"Ticket queued in outbox as {ticket_id}")
+        trace.sizes["image_bytes_saved"] = saved
+        self.metrics.queued(ticket_id, trace)
+        if saved > 0:
+            logger.info(f"Image optimization saved {saved} bytes on ticket {ticket_id}")
+            self.last_bytes_saved = saved
+        self.drainer.drain()
+
+    def on_ticket_rejected_before_queue(self, entry, error_message):
+        self.preparing -= 1
+        self.update_outbox_status()
+        self.on_ticket_rejected(None, error_message, entry)
+
+    def set_upload_widgets_visible(self, visible):
+        self.upload_label.setVisible(visible)
+        self.upload_progress.setVisible(visible)
+        self.cancel_upload_button.setVisible(visible)
+
+    def cancel_submissions(self):
+        """Cancel every ticket that is still uploading."""
+        self.drainer.cancel_all()
+        self.upload_label.setText("Cancelling upload...")
+
+    def update_outbox_status(self):
+        """Show the upload row while tickets are uploading or waiting in the outbox."""
+        in_flight = len(self.drainer.in_flight) + self.preparing
+        waiting = self.drainer.pending_count() - len(self.drainer.in_flight)
+        if not in_flight and not waiting:
+            self.set_upload_widgets_visible(False)
+            self.tray_icon.setToolTip("TicketMaker")
+            return
+        if in_flight:
+            saved_note = f" Screenshots optimized, {self.last_bytes_saved / (1024 * 1024):.1f} MB saved." if self.last_bytes_saved else ""
+            self.upload_label.setText(f"Submitting {in_flight} ticket(s)...{saved_note}")
+            self.upload_progress.setRange(0, 0)
+        else:
+            self.upload_label.setText(f"{waiting} ticket(s) waiting to be sent. Retrying automatically.")
+            self.upload_progress.setRange(0, 1)
+            self.upload_progress.setValue(0)
+        self.tray_icon.setToolTip(f"TicketMaker - {in_flight + waiting} ticket(s) pending")
+        self.set_upload_widgets_visible(True)
+        self.cancel_upload_button.setEnabled(bool(in_flight))
+
+    def restore_entry(self, entry):
+        """Put a rejected ticket back into the form, unless the user already started another one."""
+        if not entry or self.subject_input.text().strip() or self.attachments:
+            return False
+        data = entry["data"]
+        self.subject_input.setText(data["subject"])
+        self.email_input.setText(data["email"])
+        self.select_choice(self.priority_dropdown, data["priority"])
+        self.select_choice(self.status_dropdown, data["status"])
+        self.select_optional_choice(self.group_dropdown, data.get("group_id"))
+        self.select_optional_choice(self.type_dropdown, data.get("type"))
+        self.attachments = [path for _, path, _ in entry["files"] if path]
+        if self.attachments:
+            self.attachment_label.setText(f"{len(self.attachments)} attachment(s) added")
+        images = [(name, content) for name, path, content in entry["files"] if content is not None]
+        description = inline_embedded_images(data["description"], images)
+        self.editor.set_content(description)
+        return True
+
+    def keep_failed_ticket(self, ticket_id, entry, error_message):
+        """
+        Restore a rejected or cancelled form ticket, or hold it in the outbox while the form
+        is busy with the next one. Returns True if it went back into the form.
+        """
+        if self.restore_entry(entry):
+            if ticket_id is not None:
+                self.outbox.remove(ticket_id)
+            return True
+        if ticket_id is None:
+            # Failed before it was queued, so the outbox has no copy yet
+            ticket_id = self.outbox.enqueue(entry["data"], [path for _, path, _ in entry["files"] if path],
+                                            [(name, content) for name, path, content in entry["files"] if content is not None])
+        self.outbox.hold(ticket_id, error_message)
+        self.update_restore_action()
+        return False
+
+    def restore_held_ticket(self):
+        """Bring the oldest held ticket back into the form, once the form is free."""
+        held = self.outbox.held()
+        if not held:
+            self.update_restore_action()
+            return
+        self.show_normal()
+        entry = self.outbox.load(held[0])
+        if not self.restore_entry(entry):
+            QMessageBox.information(self, "Restore Failed Ticket",
+                                    "Send or clear the ticket you are working on, then restore the failed one.")
+            return
+        self.outbox.remove(held[0])
+        self.update_restore_action()
+
+    def update_restore_action(self):
+        held = len(self.outbox.held())
+        self.restore_action.setVisible(bool(held))
+        self.restore_action.setText(f"Restore Failed Ticket ({held})" if held > 1 else "Restore Failed Ticket")
+
+    def on_submission_progress(self, ticket_id, file_name, sent, total):
+        self.upload_label.setText(f"Uploading {file_name}: {sent // 1024} KB of {total // 1024} KB")
+        self.upload_progress.setRange(0, 100)
+        self.upload_progress.setValue(int(sent * 100 / total) if total else 100)
+
+    def on_api_tickets_queued(self, tickets):
+        for ticket_id, trace in tickets:
+            self.metrics.queued(ticket_id, trace)
+        logger.info(f"Queued {len(tickets)} ticket(s) from the ingestion API")
+        self.drainer.drain()
+        self.update_outbox_status()
+
+    def settle_api_ticket(self, ticket_id, entry, result):
+        """Record the outcome of an ingestion API ticket; returns False for form tickets."""
+        if not entry or entry.get("source") != "api":
+            return False
+        if self.ingest_server is not None:
+            self.ingest_server.settle(ticket_id, result)
+        return True
+
+    def on_ticket_created(self, ticket_id, ticket, entry=None):
+        logger.info(f"Outbox ticket {ticket_id} created in Freshdesk with id {ticket.get('id')}")
+        if self.settle_api_ticket(ticket_id, entry, {"status": "created", "ticket_id": ticket.get("id")}):
+            return
+        if ticket.get("id"):
+            self.history.record(ticket)
+            self.on_history_changed()
+        self.last_bytes_saved = 0
+        QMessageBox.information(self, "Success", "Ticket created successfully!")
+
+    def on_ticket_delayed(self, ticket_id, error_message, delay, status_code=0, entry=None):
+        if entry and entry.get("source") == "api":
+            return
+        if status_code == 429:
+            reason = "Freshdesk is rate limiting requests."
+        elif status_code >= 500:
+            reason = f"Freshdesk returned a server error ({status_code})."
+        else:
+            reason = "Could not reach Freshdesk."
+        self.tray_icon.showMessage(
+            "TicketMaker",
+            f"{reason} The ticket is saved and will be retried in {int(delay) + 1} seconds.",
+            QSystemTrayIcon.Warning,
+            5000
+        )
+
+    def on_ticket_rejected(self, ticket_id, error_message, entry):
+        if self.settle_api_ticket(ticket_id, entry, {"status": "rejected", "error": error_message}):
+            logger.warning(f"API ticket {ticket_id} rejected: {error_message}")
+            return
+        if not self.keep_failed_ticket(ticket_id, entry, error_message):
+            error_message += "\n\nThe ticket was kept; use Restore Failed Ticket in the tray menu to edit it."
+        QMessageBox.critical(self, "Error", error_message)
+
+    def on_ticket_cancelled(self, ticket_id, entry):
+        if self.settle_api_ticket(ticket_id, entry, {"status": "cancelled"}):
+            return
+        message = "Ticket upload cancelled."
+        if not self.keep_failed_ticket(ticket_id, entry, "Cancelled"):
+            message += " Use Restore Failed Ticket in the tray menu to edit it."
+        self.tray_icon.showMessage("TicketMaker", message, QSystemTrayIcon.Information, 3000)
+
 if __name__ == "__main__":
     import traceback
+    import multiprocessing
+
+    # Image optimization workers re-launch the frozen executable
+    multiprocessing.freeze_support()
 
+    profile = StartupProfile(STARTUP_STARTED)
+    profile.mark("imports")
+    args = parse_args(sys.argv[1:])
+
+    if args.command == "import":
+        url, api_key = load_credentials()
+        if not (url and api_key):
+            logger.critical("Failed to retrieve Freshdesk credentials. Exiting.")
+            sys.exit(1)
+        sys.exit(run_bulk_import(args, {"api_url": url, "api_key": api_key}))
+
+    # Lets QtWebEngine be imported after the QApplication exists, when the window is first shown
+    QCoreApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    profile.mark("QApplication")
+
+    # A second launch only asks the running instance to show itself
+    if not args.profile_startup:
+        if send_to_running_instance(handoff_message(args)):
+            logger.info("TicketMaker is already running; handed off to the existing instance.")
+            sys.exit(0)
+        instance_server = InstanceServer()
+        profile.mark("single-instance check")
 
     try:
         # Load credentials using DPAPI
         url, api_key = load_credentials()
+        profile.mark("credentials (DPAPI)")
 
         if url and api_key:
             config = {
@@ -504,7 +3980,7 @@ if __name__ == "__main__":
                 "api_key": api_key
             }
 
-            logger.info(f"Configuration loaded: {config}")
+            logger.info(f"Configuration loaded for {config['api_url']}")
         else:
             logger.critical("Failed to retrieve Freshdesk credentials. Exiting.")
             QMessageBox.critical(None, "Error", "Failed to load configuration. Please check your setup.")
@@ -520,18 +3996,41 @@ if __name__ == "__main__":
         splash = QSplashScreen(splash_pix, Qt.WindowStaysOnTopHint)
         splash.setWindowFlag(Qt.FramelessWindowHint)
         splash.show()
+        profile.mark("splash screen")
 
         # Launch the main window
         try:
-            window = TicketCreator(config)
+            window = TicketCreator(config, profiling=args.profile_startup)
             logger.info("Main window initialized successfully.")
         except Exception as e:
             logger.critical(f"Failed to initialize TicketCreator: {e}")
             error_details = traceback.format_exc()
             QMessageBox.critical(None, "Critical Error", f"An error occurred while initializing the application:\n\n{error_details}")
             sys.exit(1)
+        profile.mark("main window + tray icon")
+
+        # The window starts hidden, and finish(window) would wait up to a second for it to be exposed
+        splash.close()
 
-        splash.finish(window)  # Finish the splash, but do not call window.show()
+        if not args.profile_startup:
+            instance_server.message_received.connect(window.handle_handoff)
+            if args.subject or args.email or args.attach:
+                window.handle_handoff(handoff_message(args))
+
+        def startup_idle():
+            profile.mark("first event loop pass")
+            logger.info(f"Tray ready {(profile.last - profile.started) * 1000:.0f} ms after launch")
+            if args.profile_startup:
+                # Measure the deferred cost too: QtWebEngine import, Chromium start and page load
+                window.editor.interactive.connect(startup_editor_interactive)
+                window.editor.ensure()
+
+        def startup_editor_interactive(elapsed):
+            profile.mark("web editor (deferred)")
+            print(profile.report())
+            window.exit_application()
+
+        QTimer.singleShot(0, startup_idle)
 
     except Exception as e:
         # Log and display any unexpected errors
@@ -548,4 +4047,3 @@ if __name__ == "__main__":
         logger.critical(f"Runtime error: {error_details}")
         QMessageBox.critical(None, "Critical Error", f"A fatal error occurred during app execution:\n\n{error_details}")
         sys.exit(1)
-